@@ -0,0 +1,125 @@
+"""
+Certificate PDF micro-benchmark: certificate_renderer against the old flowable code path.
+
+    python -m Benchmarks.certificates --count 200
+    python -m Benchmarks.certificates --count 200 --logo Static/img/image.jpeg
+
+Reports PDFs/second and average PDF size for both renderers, single threaded.
+With --logo the new renderer also goes through logo_cache, the old one embeds the file as uploaded.
+"""
+import argparse
+import io
+import time
+
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer
+
+from certificate_renderer import renderer
+
+
+def legacy_render(params): # The flowable layout certificate_renderer replaced, rebuilt per certificate
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        pdf_buffer,
+        pagesize=A4,
+        leftMargin=40,
+        rightMargin=40,
+        topMargin=60,
+        bottomMargin=40
+    )
+
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        name="Title",
+        parent=styles["Heading1"],
+        fontSize=28,
+        alignment=TA_CENTER,
+        spaceAfter=20
+    )
+
+    desc_style = ParagraphStyle(
+        name="Description",
+        parent=styles["BodyText"],
+        fontSize=14,
+        alignment=TA_CENTER,
+        leading=18,
+        spaceAfter=30
+    )
+
+    footer_style = ParagraphStyle(
+        name="Footer",
+        parent=styles["BodyText"],
+        fontSize=12,
+        alignment=TA_CENTER,
+        leading=16
+    )
+
+    content = []
+
+    #logo
+    if params.get("logo"):
+        try:
+            img = Image(io.BytesIO(params["logo"]), width=120, height=120)
+            content.append(img)
+            content.append(Spacer(1, 20))
+        except Exception:
+            pass  # Ignore logo errors for testing
+
+    content.append(Paragraph(params["name"], title_style))
+    content.append(Paragraph(params["description"], desc_style))
+
+    footer_html = f"""
+    Issued by: {params['issuer']}<br/>
+    Issued On: {params['issued_on']}<br/>
+    Expiry Date: {params['expiry_date']}
+    """
+    content.append(Paragraph(footer_html, footer_style))
+
+    # Build PDF
+    doc.build(content)
+    pdf_buffer.seek(0)
+    return pdf_buffer
+
+
+def sample_params(n, logo=None):
+    return {
+        "name": f"Certificate of Completion {n}",
+        "description": "Awarded for completing the Advanced Workplace Safety course with distinction. " * 2,
+        "issuer": "SkillZONE Admin",
+        "issued_on": "2024-01-01",
+        "expiry_date": "2025-01-01",
+        "logo": logo,
+    }
+
+
+def pdfs_per_second(render, count, logo=None):
+    sizes = []
+    started = time.perf_counter()
+    for n in range(count):
+        sizes.append(len(render(sample_params(n, logo)).getvalue()))
+    elapsed = time.perf_counter() - started
+    return count / elapsed, sum(sizes) / len(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDFs/second for the certificate renderer vs the old flowable layout.")
+    parser.add_argument("--count", type=int, default=200, help="certificates per renderer")
+    parser.add_argument("--logo", default=None, help="image file drawn as the certificate logo")
+    args = parser.parse_args()
+
+    logo = None
+    if args.logo:
+        with open(args.logo, "rb") as f:
+            logo = f.read()
+
+    for name, render in (("flowables (old)", legacy_render), ("certificate_renderer", renderer.render)):
+        pdfs_per_second(render, 3, logo) # Warm up imports and font caches
+        rate, size = pdfs_per_second(render, args.count, logo)
+        print(f"  {name:<22} {rate:>8.1f} PDFs/s   {size / 1024:>7.1f} KiB avg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Local stand-in for the SkillZONE Rails API.
+
+Seeds employees, courses, enrollments and certificates in memory and serves the same
+JSON shapes app.py expects. Point RAILS_API_URL at it to run the frontend without Render:
+
+    python -m Benchmarks.fake_rails --port 3000 --enrollments 10000
+    RAILS_API_URL=http://127.0.0.1:3000 python app.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+from collections import Counter
+from datetime import date, timedelta
+
+from flask import Flask, Response, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+DEPARTMENTS = ["IT", "HR", "Finance", "Sales", "Operations"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+class FakeRails:
+    def __init__(self, employees=1000, courses=50, enrollments=10000, certificates=None, seed=1):
+        self.rng = random.Random(seed)
+        self.calls = Counter() # "GET courses/:id" -> count
+        self._lock = threading.Lock()
+        self._bodies = {} # collection -> (version, bytes, etag)
+        self.versions = Counter()
+        self.seed(employees, courses, enrollments, courses if certificates is None else certificates)
+
+    # Seed data
+
+    def seed(self, employees, courses, enrollments, certificates):
+        start = date(2024, 1, 1)
+        self.employees = {}
+        for i in range(1, employees + 1):
+            self.employees[i] = {
+                "id": i,
+                "first_name": f"Emp{i}",
+                "last_name": "User",
+                "email": f"emp{i}@example.com",
+                "position": "Engineer",
+                "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+                "phone": f"555{i:07d}",
+                "hire_date": (start - timedelta(days=i % 900)).isoformat(),
+                "gender": "Other",
+                "admin": i == 1, # Employee 1 is the admin
+            }
+
+        self.courses = {}
+        for i in range(1, courses + 1):
+            self.courses[i] = {
+                "id": i,
+                "title": f"Course {i}",
+                "description": f"Description for course {i}",
+                "duration_minutes": 30 + i % 90,
+                "capacity": 500,
+                "level": LEVELS[i % len(LEVELS)],
+                "start_date": start.isoformat(),
+                "end_date": (start + timedelta(days=180)).isoformat(),
+                "youtube_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            }
+
+        # Spread enrollments over distinct (employee, course) pairs
+        self.enrollments = {}
+        pairs = set()
+        employee_ids, course_ids = list(self.employees), list(self.courses)
+        capacity = len(employee_ids) * len(course_ids)
+        while len(pairs) < min(enrollments, capacity):
+            pairs.add((self.rng.choice(employee_ids), self.rng.choice(course_ids)))
+        for i, (employee_id, course_id) in enumerate(sorted(pairs), start=1):
+            completed = self.rng.random() < 0.3
+            self.enrollments[i] = {
+                "id": i,
+                "employee_id": employee_id,
+                "course_id": course_id,
+                "status": "completed" if completed else "active",
+                "progress": 100 if completed else self.rng.randrange(0, 100, 5),
+                "completed_on": start.isoformat() if completed else None,
+            }
+
+        self.certificates = {}
+        for i in range(1, certificates + 1):
+            course_id = course_ids[(i - 1) % len(course_ids)]
+            self.certificates[i] = {
+                "id": i,
+                "name": f"Certificate {i}",
+                "description": "Awarded for completing the course",
+                "issued_on": start.isoformat(),
+                "expiry_date": (start + timedelta(days=365)).isoformat(),
+                "employee_id": 1,
+                "course_id": course_id,
+                "document_url": f"/certificates/{i}/document.pdf",
+            }
+
+        self._bodies.clear()
+
+    # Serialisers matching the Rails JSON shapes
+
+    def enrollment_json(self, e):
+        return {
+            **{k: v for k, v in e.items() if k not in ("employee_id", "course_id")},
+            "employee": self.employees.get(e["employee_id"], {"id": e["employee_id"]}),
+            "course": self.courses.get(e["course_id"], {"id": e["course_id"]}),
+        }
+
+    def certificate_json(self, c):
+        return {
+            **{k: v for k, v in c.items() if k != "course_id"},
+            "course": self.courses.get(c["course_id"], {"id": c["course_id"]}),
+        }
+
+    def collection(self, name):
+        if name == "enrollments":
+            return [self.enrollment_json(e) for e in self.enrollments.values()]
+        if name == "certificates":
+            return [self.certificate_json(c) for c in self.certificates.values()]
+        return list(getattr(self, name).values())
+
+    def collection_body(self, name):
+        # Large lists are serialised once per version so the stand-in stays cheap
+        with self._lock:
+            version = sum(self.versions[n] for n in ("employees", "courses", "enrollments", "certificates"))
+            cached = self._bodies.get(name)
+            if cached and cached[0] == version:
+                return cached[1], cached[2]
+        body = json.dumps(self.collection(name)).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        with self._lock:
+            self._bodies[name] = (version, body, etag)
+        return body, etag
+
+    def touch(self, name):
+        with self._lock:
+            self.versions[name] += 1
+
+    def record(self, method, path):
+        normalized = "/".join(":id" if part.isdigit() else part for part in path.strip("/").split("/"))
+        with self._lock:
+            self.calls[f"{method} {normalized}"] += 1
+
+    def total_calls(self):
+        with self._lock:
+            return sum(self.calls.values())
+
+    # Flask app
+
+    def create_app(self):
+        api = Flask(__name__)
+        rails = self
+
+        def json_response(payload, status=200):
+            return Response(json.dumps(payload), status=status, mimetype="application/json")
+
+        @api.before_request
+        def count_call():
+            rails.record(request.method, request.path)
+
+        @api.post("/employees/login")
+        def login():
+            body = request.get_json(silent=True) or {}
+            for employee in rails.employees.values():
+                if employee["email"] == body.get("email"):
+                    return json_response(employee)
+            return json_response({"error": "Invalid login"}, 401)
+
+        @api.get("/<collection>")
+        def index(collection):
+            if collection not in ("employees", "courses", "enrollments", "certificates"):
+                return json_response({"error": "Not found"}, 404)
+            body, etag = rails.collection_body(collection)
+            if request.headers.get("If-None-Match") == etag:
+                return Response(status=304, headers={"ETag": etag})
+            return Response(body, mimetype="application/json", headers={"ETag": etag})
+
+        @api.get("/<collection>/<int:record_id>")
+        def show(collection, record_id):
+            records = getattr(rails, collection, None)
+            if not isinstance(records, dict) or record_id not in records:
+                return json_response({"error": "Not found"}, 404)
+            record = records[record_id]
+            if collection == "enrollments":
+                record = rails.enrollment_json(record)
+            elif collection == "certificates":
+                record = rails.certificate_json(record)
+            return json_response(record)
+
+        @api.post("/<collection>")
+        def create(collection):
+            records = getattr(rails, collection, None)
+            if not isinstance(records, dict):
+                return json_response({"error": "Not found"}, 404)
+            if request.files or request.form:
+                fields = {k.split("[", 1)[1].rstrip("]"): v for k, v in request.form.items() if "[" in k}
+                for upload in request.files.values():
+                    upload.read()
+            else:
+                fields = (request.get_json(silent=True) or {}).get(collection.rstrip("s"), {})
+            record_id = max(records, default=0) + 1
+            records[record_id] = {"id": record_id, **fields}
+            if collection == "certificates":
+                records[record_id]["document_url"] = f"/certificates/{record_id}/document.pdf"
+            rails.touch(collection)
+            return json_response(records[record_id], 201)
+
+        @api.patch("/<collection>/<int:record_id>")
+        def update(collection, record_id):
+            records = getattr(rails, collection, None)
+            if not isinstance(records, dict) or record_id not in records:
+                return json_response({"error": "Not found"}, 404)
+            if request.files or request.form:
+                fields = {k.split("[", 1)[1].rstrip("]"): v for k, v in request.form.items() if "[" in k}
+                for upload in request.files.values():
+                    upload.read()
+            else:
+                fields = (request.get_json(silent=True) or {}).get(collection.rstrip("s"), {})
+            records[record_id].update(fields)
+            rails.touch(collection)
+            return json_response(records[record_id])
+
+        @api.delete("/<collection>/<int:record_id>")
+        def destroy(collection, record_id):
+            records = getattr(rails, collection, None)
+            if not isinstance(records, dict) or records.pop(record_id, None) is None:
+                return json_response({"error": "Not found"}, 404)
+            rails.touch(collection)
+            return Response(status=204)
+
+        return api
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs): # Access logs would dominate benchmark output
+        pass
+
+
+class FakeRailsServer:
+    """
+    Runs a FakeRails app on a background thread, use as a context manager.
+    """
+
+    def __init__(self, rails, host="127.0.0.1", port=0):
+        self.rails = rails
+        self.server = make_server(host, port, rails.create_app(), threaded=True, request_handler=QuietHandler)
+        self.url = f"http://{host}:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake-rails", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a seeded stand-in for the SkillZONE Rails API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--enrollments", type=int, default=10000)
+    parser.add_argument("--certificates", type=int, default=None)
+    args = parser.parse_args()
+
+    rails = FakeRails(args.employees, args.courses, args.enrollments, args.certificates)
+    print(f"Fake Rails API on http://{args.host}:{args.port} "
+          f"({len(rails.employees)} employees, {len(rails.courses)} courses, {len(rails.enrollments)} enrollments)")
+    make_server(args.host, args.port, rails.create_app(), threaded=True).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Template render benchmark, no HTTP involved.
+
+    python -m Benchmarks.render                                   # default employee x enrollment grid
+    python -m Benchmarks.render --employees 100,1000 --enrollments 1000,10000,50000
+
+Seeds FakeRails data in memory, builds the same context a route passes to render_template
+and times the render, so template cost can be tracked against employee and enrollment counts.
+"""
+import argparse
+import statistics
+import time
+
+from flask import render_template, session
+
+import app as flask_app
+from Benchmarks.fake_rails import FakeRails
+from Benchmarks.run import use_repo_templates
+
+
+# Route name -> (template, builder(rails) -> render context), mirroring what each route does
+def manage_employees_context(rails):
+    employees, enrollments = rails.collection("employees"), rails.collection("enrollments")
+    return {"employees": employees, "enrollments_by_employee": flask_app.group_by_employee(enrollments)}
+
+
+def admin_enrollments_context(rails):
+    return {"enrollments": rails.collection("enrollments"), "courses": rails.collection("courses")}
+
+
+PAGES = {
+    "manage_employees": ("Manage_employee.html", manage_employees_context),
+    "admin_enrollments": ("Admin_enrollments.html", admin_enrollments_context),
+}
+
+
+def time_render(template, build, rails, repeat):
+    timings, size = [], 0
+    with flask_app.app.test_request_context("/"):
+        session["employee"] = rails.employees[1]
+        for _ in range(repeat):
+            started = time.perf_counter()
+            html = render_template(template, **build(rails)) # Context building counts, it is part of the route
+            timings.append(time.perf_counter() - started)
+            size = len(html.encode())
+    return statistics.median(timings) * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time template renders against employee and enrollment counts.")
+    parser.add_argument("--employees", default="100,1000,5000", help="comma separated employee counts")
+    parser.add_argument("--enrollments", default="1000,10000,50000", help="comma separated enrollment counts")
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="renders per cell, the median is reported")
+    args = parser.parse_args()
+
+    use_repo_templates()
+    for page in (p for p in args.pages.split(",") if p):
+        template, build = PAGES[page]
+        print(f"{page} ({template})")
+        for employees in (int(n) for n in args.employees.split(",") if n):
+            for enrollments in (int(n) for n in args.enrollments.split(",") if n):
+                rails = FakeRails(employees=employees, courses=args.courses, enrollments=enrollments)
+                ms, size = time_render(template, build, rails, args.repeat)
+                print(f"  {employees:>7} employees {len(rails.enrollments):>7} enrollments   {ms:>10.2f} ms   {size / 1024:>9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
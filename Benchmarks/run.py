@@ -0,0 +1,273 @@
+"""
+Benchmark driver for the app.py routes against a local FakeRails server.
+
+    python -m Benchmarks.run                                  # 1k / 10k / 100k enrollments
+    python -m Benchmarks.run --scales 1000 --requests 100 --concurrency 8
+    python -m Benchmarks.run --compare Benchmarks/results/previous.json
+
+For every scale it seeds the stand-in, points app.RAILS_API_URL at it and drives each route
+through Flask test clients, recording p50/p95/p99 latency, throughput and Rails calls per request.
+Results are written as JSON under Benchmarks/results/ so runs can be compared.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from jinja2 import FileSystemLoader, TemplateNotFound
+
+import app as flask_app
+import api_cache
+import conditional_get
+import enrollment_index
+import metrics
+from Benchmarks.fake_rails import FakeRails, FakeRailsServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "Benchmarks", "results")
+ROUTES = [
+    "dashboard",
+    "courses",
+    "take_course",
+    "update_progress",
+    "admin_enrollments",
+    "manage_employees",
+    "create_certificate",
+]
+
+
+class CaseInsensitiveLoader(FileSystemLoader):
+    """
+    The routes name templates with different casing than the files in Templates/
+    (e.g. "Courses.html" vs courses.html), so resolve names case-insensitively.
+    """
+
+    def __init__(self, searchpath):
+        super().__init__(searchpath)
+        self.names = {name.lower(): name for name in os.listdir(searchpath)}
+
+    def get_source(self, environment, template):
+        real = self.names.get(template.lower())
+        if real is None:
+            raise TemplateNotFound(template)
+        return super().get_source(environment, real)
+
+
+def use_repo_templates():
+    flask_app.app.jinja_loader = CaseInsensitiveLoader(os.path.join(ROOT, "Templates"))
+
+
+def reset_state():
+    api_cache.cache.clear()
+    enrollment_index.index.clear()
+    conditional_get.validators.clear()
+    flask_app.admin_summary.clear()
+    metrics.registry.reset()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    k = (len(ordered) - 1) * pct / 100
+    lower, upper = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def login(email):
+    client = flask_app.app.test_client()
+    resp = client.post("/login", data={"email": email, "hire_date": "2024-01-01"})
+    if resp.status_code != 302:
+        raise RuntimeError(f"login failed for {email}: {resp.status_code}")
+    return client
+
+
+def pick_learner(rails):
+    # A non-admin employee with at least one enrollment, and one of their courses
+    for e in rails.enrollments.values():
+        employee = rails.employees.get(e["employee_id"])
+        if employee and not employee["admin"]:
+            return employee, e["course_id"]
+    raise RuntimeError("seed data has no enrolled employees")
+
+
+def route_request(route, client, course_id, n):
+    if route == "dashboard":
+        return client.get("/dashboard")
+    if route == "courses":
+        return client.get("/courses")
+    if route == "take_course":
+        return client.get(f"/course/{course_id}/take")
+    if route == "update_progress":
+        return client.post(f"/update-progress/{course_id}", json={"progress": (n * 5) % 100})
+    if route == "admin_enrollments":
+        return client.get("/admin/enrollments")
+    if route == "manage_employees":
+        return client.get("/manage_employees")
+    if route == "create_certificate":
+        return client.post(
+            "/admin/certificates/create",
+            data={
+                "name": f"Benchmark Cert {n}",
+                "description": "Generated by the benchmark driver",
+                "issued_on": "2024-01-01",
+                "expiry_date": "2025-01-01",
+                "course_id": str(course_id),
+                "logo": (io.BytesIO(b""), ""),
+            },
+            content_type="multipart/form-data",
+            headers={"Accept": "application/json"},
+        )
+    raise ValueError(route)
+
+
+def bench_route(route, rails, learner, course_id, args):
+    email = rails.employees[1]["email"] if route in ("admin_enrollments", "manage_employees", "create_certificate") else learner["email"]
+    clients = [login(email) for _ in range(args.concurrency)]
+    if args.cold:
+        reset_state()
+
+    for n in range(args.warmup):
+        route_request(route, clients[0], course_id, n)
+    if route == "create_certificate":
+        flask_app.certificate_jobs.join()
+
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    calls_before = rails.total_calls()
+
+    def one(n):
+        nonlocal errors
+        if args.cold:
+            reset_state()
+        started = time.perf_counter()
+        resp = route_request(route, clients[n % len(clients)], course_id, n)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if resp.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(one, range(args.requests)))
+    wall = time.perf_counter() - started
+
+    result = {}
+    if route == "create_certificate": # Requests only enqueue, also time until every job has reached Rails
+        flask_app.certificate_jobs.join()
+        result["jobs_drained_s"] = round(time.perf_counter() - started, 4)
+    if route == "update_progress": # Buffered writes are part of the route's upstream cost
+        flask_app.progress_buffer.flush()
+
+    result.update({
+        "requests": args.requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "throughput_rps": round(args.requests / wall, 2),
+        "upstream_calls_per_request": round((rails.total_calls() - calls_before) / args.requests, 3),
+    })
+    return result
+
+
+def run_scale(enrollments, args):
+    employees = args.employees or max(50, enrollments // 10)
+    rails = FakeRails(employees=employees, courses=args.courses, enrollments=enrollments)
+    learner, course_id = pick_learner(rails)
+
+    with FakeRailsServer(rails) as server:
+        flask_app.RAILS_API_URL = server.url
+        reset_state()
+        results = {}
+        for route in args.routes:
+            results[route] = bench_route(route, rails, learner, course_id, args)
+            print(f"  {route:<20} p50 {results[route]['p50_ms']:>9.2f} ms   p95 {results[route]['p95_ms']:>9.2f} ms   "
+                  f"{results[route]['throughput_rps']:>8.1f} req/s   {results[route]['upstream_calls_per_request']:.2f} upstream/req")
+        flask_app.admin_summary.wait()
+        flask_app.progress_buffer.flush()
+
+    return {
+        "seed": {"employees": employees, "courses": args.courses, "enrollments": len(rails.enrollments)},
+        "routes": results,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(previous_path, current):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} ({previous['meta'].get('git_revision')}):")
+    for scale, run in current["results"].items():
+        before = previous["results"].get(scale)
+        if not before:
+            continue
+        for route, stats in run["routes"].items():
+            old = before["routes"].get(route)
+            if not old:
+                continue
+            change = (stats["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0
+            print(f"  {scale:>7} {route:<20} p50 {old['p50_ms']:>9.2f} -> {stats['p50_ms']:>9.2f} ms ({change:+.1f}%)   "
+                  f"upstream/req {old['upstream_calls_per_request']} -> {stats['upstream_calls_per_request']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.py routes against a local Rails stand-in.")
+    parser.add_argument("--scales", default="1000,10000,100000", help="comma separated enrollment counts")
+    parser.add_argument("--employees", type=int, default=None, help="default: enrollments / 10")
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--routes", default=",".join(ROUTES))
+    parser.add_argument("--requests", type=int, default=50, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--cold", action="store_true", help="clear frontend caches before every request")
+    parser.add_argument("--output", default=None, help="JSON file to write, default Benchmarks/results/<timestamp>.json")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to diff against")
+    args = parser.parse_args()
+    args.routes = [r for r in args.routes.split(",") if r]
+
+    use_repo_templates()
+    flask_app.app.config["TESTING"] = True
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": {},
+    }
+
+    for scale in (int(s) for s in args.scales.split(",") if s):
+        print(f"{scale} enrollments")
+        report["results"][str(scale)] = run_scale(scale, args)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("bench-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
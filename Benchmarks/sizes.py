@@ -0,0 +1,100 @@
+"""
+Byte counts for every page template, before and after whitespace trimming and compression.
+
+    python -m Benchmarks.sizes --enrollments 10000
+
+Each page is fetched through Flask against a FakeRails server twice: once with Jinja's
+trim_blocks/lstrip_blocks switched off (the "before") and once with the app's settings.
+The trimmed body is then sized gzipped and, when the brotli package is installed, brotli compressed.
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+import app as flask_app
+import compression
+from Benchmarks.fake_rails import FakeRails, FakeRailsServer
+from Benchmarks.run import RESULTS_DIR, login, pick_learner, use_repo_templates
+
+# (template, url, who): who is "admin", "learner" or None for logged out pages
+PAGES = [
+    ("Index.html", "/", None),
+    ("Login.html", "/login", None),
+    ("Register.html", "/register", None),
+    ("Dashboard.html", "/dashboard", "learner"),
+    ("Courses.html", "/courses", "learner"),
+    ("take_course.html", "/course/{course_id}/take", "learner"),
+    ("Employee_profile.html", "/employee/profile", "learner"),
+    ("Admin_dashboard.html", "/admin-dashboard", "admin"),
+    ("Manage_employee.html", "/manage_employees", "admin"),
+    ("Manage_employee.html (all)", "/manage_employees?all=1", "admin"),
+    ("admin_certificate.html", "/admin/certificates", "admin"),
+    ("Manage_course.html", "/manage-courses", "admin"),
+    ("Admin_enrollments.html", "/admin/enrollments", "admin"),
+    ("Admin_enrollments.html (all)", "/admin/enrollments?all=1", "admin"),
+]
+
+
+def fetch_bodies(rails, trim):
+    env = flask_app.app.jinja_env
+    saved = env.trim_blocks, env.lstrip_blocks
+    env.trim_blocks = env.lstrip_blocks = trim
+    env.cache.clear() # Templates compiled with the other setting must not be reused
+    try:
+        learner, course_id = pick_learner(rails)
+        clients = {None: flask_app.app.test_client(), "admin": login(rails.employees[1]["email"]), "learner": login(learner["email"])}
+        flask_app.admin_summary.refresh(rails.employees[1]["id"]) # Prime the dashboard stats so the page shows them
+        return {
+            name: clients[who].get(url.format(course_id=course_id)).get_data()
+            for name, url, who in PAGES
+        }
+    finally:
+        env.trim_blocks, env.lstrip_blocks = saved
+        env.cache.clear()
+
+
+def measure(rails):
+    before, after = fetch_bodies(rails, trim=False), fetch_bodies(rails, trim=True)
+    rows = {}
+    for name, _, _ in PAGES:
+        body = after[name]
+        rows[name] = {
+            "untrimmed": len(before[name]),
+            "trimmed": len(body),
+            "gzip": len(compression.compress(body, "gzip")),
+            "br": len(compression.compress(body, "br")) if compression.brotli is not None else None,
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report page sizes before/after trimming and compression.")
+    parser.add_argument("--employees", type=int, default=None, help="default: enrollments / 10")
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--enrollments", type=int, default=10000)
+    parser.add_argument("--output", default=None, help="JSON file to write, default Benchmarks/results/sizes-<timestamp>.json")
+    args = parser.parse_args()
+
+    use_repo_templates()
+    flask_app.app.config["TESTING"] = True
+    rails = FakeRails(employees=args.employees or max(50, args.enrollments // 10), courses=args.courses, enrollments=args.enrollments)
+
+    with FakeRailsServer(rails) as server:
+        flask_app.RAILS_API_URL = server.url
+        rows = measure(rails)
+
+    print(f"{'template':<30} {'untrimmed':>12} {'trimmed':>12} {'gzip':>12} {'br':>12}")
+    for name, row in rows.items():
+        br = f"{row['br']:>12,}" if row["br"] is not None else f"{'n/a':>12}"
+        print(f"{name:<30} {row['untrimmed']:>12,} {row['trimmed']:>12,} {row['gzip']:>12,} {br}")
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("sizes-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"seed": {"employees": len(rails.employees), "courses": len(rails.courses), "enrollments": len(rails.enrollments)}, "pages": rows}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
 import pytest
+import api_client
+import api_cache
+import enrollment_index
+import conditional_get
+import metrics
+import singleflight
+import circuit_breaker
+import course_catalog
 import app as flask_app
 
 
@@ -13,6 +21,29 @@ def fake_render(template_name, **context):
     return "\n".join(output)
 
 
+@pytest.fixture(autouse=True)
+def reset_upstream_state(monkeypatch):
+    """
+    Start every test with empty in-process caches so fakes from one test never leak into another.
+    """
+    api_cache.cache.clear()
+    enrollment_index.index.clear()
+    course_catalog.catalog.clear()
+    conditional_get.validators.clear()
+    metrics.registry.reset()
+    singleflight.flights.reset()
+    circuit_breaker.breaker.reset()
+    yield
+    flask_app.admin_summary.clear()  # waits for a background refresh while the test's fakes are still patched
+    flask_app.certificate_jobs.clear()  # same for queued certificate jobs
+    flask_app.bulk_certificates.clear()  # and for bulk issuance batches
+    api_cache.cache.clear()
+    enrollment_index.index.clear()
+    course_catalog.catalog.clear()
+    conditional_get.validators.clear()
+    flask_app.progress_buffer.clear()  # never let buffered test writes reach the real API at exit
+
+
 @pytest.fixture
 def app(monkeypatch):
     """
@@ -24,6 +55,7 @@ def app(monkeypatch):
 
     # Patch render_template globally in your app
     monkeypatch.setattr(flask_app, "render_template", fake_render)
+    monkeypatch.setattr(flask_app, "stream_template", lambda name, **context: fake_render(name, streamed=True, **context))
 
     return flask_app.app
 
@@ -36,6 +68,18 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def http():
+    """
+    Install a fresh pooled session as the upstream client.
+    Tests patch its get/post/patch/delete instead of the requests module.
+    """
+    session = api_client.build_session(pool_size=1)
+    api_client.set_session(session)
+    yield session
+    api_client.set_session(None)
+
+
 @pytest.fixture
 def employee_user():
     return {
@@ -2,7 +2,7 @@ from unittest.mock import MagicMock
 import app as flask_app
 
 
-def test_api_get_success_dict(monkeypatch):
+def test_api_get_success_dict(monkeypatch, http):
     def fake_get_current_employee():
         return {"id": 1}
 
@@ -11,13 +11,13 @@ def test_api_get_success_dict(monkeypatch):
     mock_resp.json.return_value = {"foo": "bar"}
 
     monkeypatch.setattr(flask_app, "get_current_employee", fake_get_current_employee)
-    monkeypatch.setattr(flask_app.requests, "get", lambda url, params=None: mock_resp)
+    monkeypatch.setattr(http, "get", lambda url, params=None, **kwargs: mock_resp)
 
     result = flask_app.api_get("something")
     assert result == {"foo": "bar"}
 
 
-def test_api_get_success_string_json(monkeypatch):
+def test_api_get_success_string_json(monkeypatch, http):
     def fake_get_current_employee():
         return {"id": 1}
 
@@ -26,90 +26,149 @@ def test_api_get_success_string_json(monkeypatch):
     mock_resp.json.return_value = '{"hello": "world"}'
 
     monkeypatch.setattr(flask_app, "get_current_employee", fake_get_current_employee)
-    monkeypatch.setattr(flask_app.requests, "get", lambda url, params=None: mock_resp)
+    monkeypatch.setattr(http, "get", lambda url, params=None, **kwargs: mock_resp)
 
     result = flask_app.api_get("something")
     assert result == {"hello": "world"}
 
 
-def test_api_get_non_200(monkeypatch):
+def test_api_get_non_200(monkeypatch, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 500
 
     monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
-    monkeypatch.setattr(flask_app.requests, "get", lambda url, params=None: mock_resp)
+    monkeypatch.setattr(http, "get", lambda url, params=None, **kwargs: mock_resp)
 
     result = flask_app.api_get("something")
     assert result is None
 
 
-def test_api_get_exception(monkeypatch):
+def test_api_get_exception(monkeypatch, http):
     def boom(*args, **kwargs):
         raise RuntimeError("boom")
 
     monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
-    monkeypatch.setattr(flask_app.requests, "get", boom)
+    monkeypatch.setattr(http, "get", boom)
 
     result = flask_app.api_get("something")
     assert result is None
 
 
-def test_api_post_json(monkeypatch):
+def test_api_post_json(monkeypatch, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 201
 
-    def fake_post(url, params=None, json=None, data=None, files=None):
+    def fake_post(url, params=None, json=None, data=None, files=None, **kwargs):
         assert "employee_id" in params
         assert json == {"foo": "bar"}
         return mock_resp
 
     monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
-    monkeypatch.setattr(flask_app.requests, "post", fake_post)
+    monkeypatch.setattr(http, "post", fake_post)
 
     resp = flask_app.api_post("path", {"foo": "bar"})
     assert resp.status_code == 201
 
 
-def test_api_post_files(monkeypatch):
+def test_api_post_files(monkeypatch, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 201
 
-    def fake_post(url, params=None, json=None, data=None, files=None):
-        assert data == {"field": "value"}
-        assert "file" in files
+    def fake_post(url, params=None, json=None, data=None, files=None, headers=None, **kwargs):
+        body = b"".join(data) # Streamed multipart body, requests no longer encodes it
+        assert files is None
+        assert headers["Content-Type"] == data.content_type
+        assert b'name="field"\r\n\r\nvalue' in body
+        assert b'name="file"; filename="file"' in body and b"123" in body
         return mock_resp
 
     monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
-    monkeypatch.setattr(flask_app.requests, "post", fake_post)
+    monkeypatch.setattr(http, "post", fake_post)
 
     resp = flask_app.api_post("path", {"field": "value"}, files={"file": b"123"})
     assert resp.status_code == 201
 
 
-def test_api_patch(monkeypatch):
+def test_api_patch(monkeypatch, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
 
-    def fake_patch(url, params=None, json=None):
+    def fake_patch(url, params=None, json=None, **kwargs):
         assert json == {"update": "yes"}
         return mock_resp
 
     monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
-    monkeypatch.setattr(flask_app.requests, "patch", fake_patch)
+    monkeypatch.setattr(http, "patch", fake_patch)
 
     resp = flask_app.api_patch("path", {"update": "yes"})
     assert resp.status_code == 200
 
 
-def test_api_delete(monkeypatch):
+def test_api_delete(monkeypatch, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 204
 
-    def fake_delete(url, params=None):
+    def fake_delete(url, params=None, **kwargs):
         return mock_resp
 
     monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
-    monkeypatch.setattr(flask_app.requests, "delete", fake_delete)
+    monkeypatch.setattr(http, "delete", fake_delete)
 
     resp = flask_app.api_delete("path")
     assert resp.status_code == 204
+
+
+def test_session_is_shared_across_calls(monkeypatch):
+    monkeypatch.setattr(flask_app.api_client, "_session", None)
+
+    first = flask_app.api_client.get_session()
+    second = flask_app.api_client.get_session()
+    assert first is second
+
+    adapter = first.get_adapter("https://skillzone-api.onrender.com")
+    assert adapter._pool_maxsize == flask_app.api_client.API_POOL_SIZE
+
+
+def test_login_uses_pooled_session(client, http, monkeypatch, employee_user):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = employee_user
+    calls = []
+
+    def fake_post(url, json=None, **kwargs):
+        calls.append(url)
+        return mock_resp
+
+    monkeypatch.setattr(http, "post", fake_post)
+
+    client.post("/login", data={"email": employee_user["email"], "hire_date": "2024-01-01"})
+    assert calls == [f"{flask_app.RAILS_API_URL}/employees/login"]
+
+
+def test_api_get_many_runs_concurrently_with_session_employee(app, monkeypatch, admin_user):
+    import threading
+    barrier = threading.Barrier(3, timeout=2)
+
+    def fake_api_get(path):
+        barrier.wait()  # only passes if all three calls are in flight together
+        return {"path": path, "employee": flask_app.get_current_employee()["id"]}
+
+    monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+
+    with app.test_request_context("/"):
+        flask_app.session["employee"] = admin_user
+        results = flask_app.api_get_many(["employees", "courses", "certificates"])
+
+    assert [r["path"] for r in results] == ["employees", "courses", "certificates"]
+    assert all(r["employee"] == admin_user["id"] for r in results)
+
+
+def test_api_get_many_keeps_none_per_failed_resource(monkeypatch):
+    def fake_api_get(path):
+        if path == "courses":
+            raise RuntimeError("boom")
+        return [path]
+
+    monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+
+    assert flask_app.api_get_many(["employees", "courses"]) == [["employees"], None]
@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+import api_cache
+import app as flask_app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_miss_then_hit():
+    cache = api_cache.ApiCache(ttls={"courses": 60})
+    assert cache.get("courses", 1) is api_cache.MISS
+
+    cache.set("courses", 1, [])
+    assert cache.get("courses", 1) == []
+    assert cache.get("courses", 2) is api_cache.MISS  # other employee scope
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_entries_expire_after_resource_ttl():
+    clock = FakeClock()
+    cache = api_cache.ApiCache(ttls={"courses": 60, "enrollments": 5}, clock=clock)
+    cache.set("courses", 1, ["c"])
+    cache.set("enrollments", 1, ["e"])
+
+    clock.now = 10
+    assert cache.get("courses", 1) == ["c"]
+    assert cache.get("enrollments", 1) is api_cache.MISS
+
+
+def test_lru_bound():
+    cache = api_cache.ApiCache(max_entries=2, ttls={}, default_ttl=60)
+    cache.set("a", None, 1)
+    cache.set("b", None, 2)
+    cache.get("a", None)  # a is now most recently used
+    cache.set("c", None, 3)
+
+    assert cache.get("b", None) is api_cache.MISS
+    assert cache.get("a", None) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_evicts_collection_member_and_dependents():
+    cache = api_cache.ApiCache(ttls={}, default_ttl=60)
+    for path in ["courses", "courses/12", "courses/13", "enrollments", "employees"]:
+        cache.set(path, 1, path)
+
+    cache.invalidate("courses/12")
+
+    assert cache.get("courses", 1) is api_cache.MISS
+    assert cache.get("courses/12", 1) is api_cache.MISS
+    assert cache.get("enrollments", 1) is api_cache.MISS  # embeds course data
+    assert cache.get("courses/13", 1) == "courses/13"
+    assert cache.get("employees", 1) == "employees"
+
+
+def test_api_get_served_from_cache_until_write(monkeypatch, http):
+    calls = []
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = [{"id": 1}]
+
+    def fake_get(url, params=None, **kwargs):
+        calls.append(url)
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 2})
+    monkeypatch.setattr(http, "get", fake_get)
+    monkeypatch.setattr(http, "patch", lambda url, params=None, json=None, **kwargs: mock_resp)
+
+    assert flask_app.api_get("courses") == [{"id": 1}]
+    assert flask_app.api_get("courses") == [{"id": 1}]
+    assert len(calls) == 1
+
+    flask_app.api_patch("courses/1", {"course": {"title": "New"}})
+    flask_app.api_get("courses")
+    assert len(calls) == 2
+
+
+def test_api_get_does_not_cache_failures(monkeypatch, http):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 500
+    calls = []
+
+    def fake_get(url, params=None, **kwargs):
+        calls.append(url)
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 2})
+    monkeypatch.setattr(http, "get", fake_get)
+
+    assert flask_app.api_get("courses") is None
+    assert flask_app.api_get("courses") is None
+    assert len(calls) == 2
@@ -0,0 +1,77 @@
+import gzip
+import io
+import json
+import pytest
+from PIL import Image
+import app as flask_app
+import assets
+
+
+@pytest.fixture
+def static_tree(tmp_path):
+    static = tmp_path / "Static"
+    (static / "css").mkdir(parents=True)
+    (static / "img").mkdir()
+    (static / "css" / "base.css").write_text("body { color: #fff; }\n" * 50)
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 600), "teal").save(buffer, "PNG")
+    (static / "img" / "logo.png").write_bytes(buffer.getvalue())
+    return static, static / "dist"
+
+
+def test_build_fingerprints_precompresses_and_resizes(static_tree):
+    static, dist = static_tree
+    manifest = assets.build(str(static), str(dist), widths=(300, 2000))
+
+    css = manifest["files"]["css/base.css"]
+    assert css.startswith("css/base.") and css.endswith(".css") and css != "css/base.css"
+    assert gzip.decompress((dist / (css + ".gz")).read_bytes()) == (static / "css" / "base.css").read_bytes()
+
+    variants = manifest["variants"]["img/logo.png"]
+    assert {(v["type"], v["width"]) for v in variants} == {
+        ("image/jpeg", 300), ("image/webp", 300), ("image/jpeg", 1200), ("image/webp", 1200),
+    }
+    with Image.open(dist / next(v["path"] for v in variants if v["width"] == 300 and v["type"] == "image/webp")) as small:
+        assert small.format == "WEBP" and small.size == (300, 150)
+    assert json.loads((dist / "manifest.json").read_text()) == manifest
+
+
+def test_content_change_changes_the_name(static_tree):
+    static, dist = static_tree
+    before = assets.build(str(static), str(dist), widths=())["files"]["css/base.css"]
+    (static / "css" / "base.css").write_text("body { color: #000; }\n")
+    after = assets.build(str(static), str(dist), widths=())["files"]["css/base.css"]
+    assert before != after
+
+
+def test_asset_url_uses_manifest_and_falls_back_to_static(static_tree):
+    static, dist = static_tree
+    built = assets.Assets(str(static), str(dist), auto_build=True)
+    missing = assets.Assets(str(static), str(dist / "nowhere"), auto_build=False)
+
+    with flask_app.app.test_request_context("/"):
+        assert built.url("css/base.css").startswith("/assets/css/base.")
+        assert "400w" in built.srcset("img/logo.png", "image/webp")
+        assert missing.url("css/base.css") == "/static/css/base.css"
+        assert missing.srcset("img/logo.png", "image/webp") == ""
+
+
+def test_assets_served_precompressed_and_immutable(client, monkeypatch, static_tree):
+    static, dist = static_tree
+    manifest = assets.build(str(static), str(dist), widths=())
+    monkeypatch.setattr(flask_app, "DIST_DIR", str(dist))
+    css = manifest["files"]["css/base.css"]
+
+    resp = client.get(f"/assets/{css}", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.mimetype == "text/css"
+    assert "immutable" in resp.headers["Cache-Control"]
+    assert "max-age=31536000" in resp.headers["Cache-Control"]
+    assert gzip.decompress(resp.get_data()).startswith(b"body")
+
+    plain = client.get(f"/assets/{css}")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_data().startswith(b"body")
+
+    assert client.get("/assets/css/missing.css").status_code == 404
@@ -68,15 +68,15 @@ def test_login_get(client):
     assert resp.status_code == 200
 
 
-def test_login_employee_success(client, monkeypatch, employee_user):
+def test_login_employee_success(client, monkeypatch, employee_user, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
     mock_resp.json.return_value = employee_user
 
-    def fake_post(url, json=None):
+    def fake_post(url, json=None, **kwargs):
         return mock_resp
 
-    monkeypatch.setattr(flask_app.requests, "post", fake_post)
+    monkeypatch.setattr(http, "post", fake_post)
 
     resp = client.post(
         "/login",
@@ -87,12 +87,12 @@ def test_login_employee_success(client, monkeypatch, employee_user):
     assert "/dashboard" in resp.headers["Location"]
 
 
-def test_login_admin_success(client, monkeypatch, admin_user):
+def test_login_admin_success(client, monkeypatch, admin_user, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
     mock_resp.json.return_value = admin_user
 
-    monkeypatch.setattr(flask_app.requests, "post", lambda url, json=None: mock_resp)
+    monkeypatch.setattr(http, "post", lambda url, json=None, **kwargs: mock_resp)
 
     resp = client.post(
         "/login",
@@ -103,11 +103,11 @@ def test_login_admin_success(client, monkeypatch, admin_user):
     assert "/admin-dashboard" in resp.headers["Location"]
 
 
-def test_login_failure(client, monkeypatch):
+def test_login_failure(client, monkeypatch, http):
     mock_resp = MagicMock()
     mock_resp.status_code = 401
 
-    monkeypatch.setattr(flask_app.requests, "post", lambda url, json=None: mock_resp)
+    monkeypatch.setattr(http, "post", lambda url, json=None, **kwargs: mock_resp)
 
     resp = client.post(
         "/login",
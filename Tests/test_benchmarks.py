@@ -0,0 +1,59 @@
+import app as flask_app
+from Benchmarks.fake_rails import FakeRails, FakeRailsServer
+from Benchmarks.run import percentile, use_repo_templates
+from Benchmarks.render import PAGES, time_render
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50.5
+    assert percentile(samples, 99) == 99.01
+    assert percentile([], 50) is None
+
+
+def test_fake_rails_seed_shapes():
+    rails = FakeRails(employees=20, courses=5, enrollments=40)
+    assert len(rails.enrollments) == 40
+    enrollment = rails.enrollment_json(next(iter(rails.enrollments.values())))
+    assert {"id", "status", "progress", "employee", "course"} <= set(enrollment)
+    assert rails.employees[1]["admin"] is True
+
+
+def test_api_helpers_against_fake_rails(monkeypatch):
+    rails = FakeRails(employees=10, courses=3, enrollments=12)
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: rails.employees[1])
+
+    with FakeRailsServer(rails) as server:
+        monkeypatch.setattr(flask_app, "RAILS_API_URL", server.url)
+
+        assert len(flask_app.api_get("enrollments")) == 12
+        res = flask_app.api_patch("courses/1", {"course": {"title": "Renamed"}})
+        assert res.status_code == 200
+        assert flask_app.api_get("courses/1")["title"] == "Renamed"
+
+    assert rails.calls["GET enrollments"] == 1
+    assert rails.calls["PATCH courses/:id"] == 1
+
+
+def test_render_benchmark_renders_real_templates(monkeypatch):
+    monkeypatch.setattr(flask_app.app, "jinja_loader", flask_app.app.jinja_loader)
+    use_repo_templates()
+    rails = FakeRails(employees=5, courses=3, enrollments=10)
+
+    for template, build in PAGES.values():
+        ms, size = time_render(template, build, rails, repeat=1)
+        assert ms > 0 and size > 0
+
+
+def test_admin_enrollments_renders_course_options_once(monkeypatch):
+    monkeypatch.setattr(flask_app.app, "jinja_loader", flask_app.app.jinja_loader)
+    use_repo_templates()
+    rails = FakeRails(employees=5, courses=3, enrollments=10)
+    template, build = PAGES["admin_enrollments"]
+
+    with flask_app.app.test_request_context("/"):
+        html = flask_app.render_template(template, **build(rails))
+
+    assert html.count('<select name="course_id"') == 1
+    assert html.count('<option value="1">') == 1
+    assert html.count('data-bs-target="#editEnrollment"') == 10
@@ -0,0 +1,151 @@
+import io
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+import app as flask_app
+from bulk_certificates import BulkIssuance
+from certificate_renderer import render_certificate
+
+PARAMS = {
+    "name": "Fire Safety",
+    "description": "Completed the fire safety course",
+    "issued_on": "2024-01-01",
+    "expiry_date": "2025-01-01",
+    "course_id": "7",
+    "issuer": "Admin User",
+    "requested_by": 2,
+    "logo": None,
+}
+
+
+def fake_render(params):
+    return f"%PDF {params['recipient']}".encode()
+
+
+def recipients(n):
+    return [{"employee_id": i, "recipient": f"Emp {i}"} for i in range(1, n + 1)]
+
+
+def test_bulk_uploads_every_recipient_and_builds_zip():
+    uploads = []
+
+    def upload(params, pdf):
+        uploads.append((params["employee_id"], pdf.read()))
+        return True, []
+
+    bulk = BulkIssuance(fake_render, upload, processes=0, upload_concurrency=2)
+    batch_id = bulk.submit(PARAMS, recipients(5), keep_zip=True)
+    bulk.join()
+
+    status = bulk.status(batch_id)
+    assert status["status"] == "done"
+    assert (status["total"], status["rendered"], status["uploaded"], status["failed"]) == (5, 5, 5, 0)
+    assert sorted(uploads) == [(i, f"%PDF Emp {i}".encode()) for i in range(1, 6)]
+
+    with zipfile.ZipFile(bulk.zip_file(batch_id)) as zf:
+        assert len(zf.namelist()) == 5
+        assert zf.read("certificate-3-Emp_3.pdf") == b"%PDF Emp 3"
+
+
+def test_bulk_retries_individual_failures():
+    attempts = {}
+
+    def upload(params, pdf):
+        attempts[params["employee_id"]] = attempts.get(params["employee_id"], 0) + 1
+        if params["employee_id"] == 2 and attempts[2] < 3:
+            return False, ["Temporary error"]
+        if params["employee_id"] == 3:
+            raise ConnectionError("Rails is down")
+        return True, []
+
+    bulk = BulkIssuance(fake_render, upload, processes=0, attempts=3, retry_delay=0)
+    batch_id = bulk.submit(PARAMS, recipients(3))
+    bulk.join()
+
+    status = bulk.status(batch_id)
+    assert status["status"] == "failed"
+    assert (status["uploaded"], status["failed"], status["retries"]) == (2, 1, 4)
+    assert attempts == {1: 1, 2: 3, 3: 3}
+    assert status["errors"] == [{"employee_id": 3, "recipient": "Emp 3", "error": "Rails is down"}]
+    assert bulk.zip_file(batch_id) is None # Not requested
+
+
+def test_bulk_renders_on_a_process_pool():
+    uploads = []
+    bulk = BulkIssuance(render_certificate, lambda params, pdf: (uploads.append(pdf.read()) or True, []), processes=2)
+    try:
+        batch_id = bulk.submit(PARAMS, recipients(3))
+        bulk.join()
+    finally:
+        bulk.close()
+
+    assert bulk.status(batch_id)["uploaded"] == 3
+    assert all(pdf.startswith(b"%PDF") for pdf in uploads)
+
+
+@pytest.fixture
+def rails(monkeypatch):
+    enrollments = [
+        {"employee": {"id": 1}, "course": {"id": 7}, "status": "completed"},
+        {"employee": {"id": 3}, "course": {"id": 7}, "status": "completed"},
+        {"employee": {"id": 4}, "course": {"id": 7}, "status": "in_progress"},
+        {"employee": {"id": 5}, "course": {"id": 8}, "status": "completed"},
+        {"employee": {"id": 6}, "course": {"id": 7}, "status": "completed"},
+    ]
+    employees = [
+        {"id": 1, "first_name": "Ann", "last_name": "Lee"},
+        {"id": 3, "first_name": "Bo", "last_name": "Chan"},
+        {"id": 6, "first_name": "Cy", "last_name": "Dee"},
+    ]
+    certificates = [{"id": 9, "course": {"id": 7}, "employee": {"id": 6}}] # Already certified
+    data = {"enrollments": enrollments, "employees": employees, "certificates": certificates}
+    monkeypatch.setattr(flask_app, "api_get", lambda path, employee_id=None: data[path])
+
+    posts = []
+    mock_resp = MagicMock()
+    mock_resp.status_code = 201
+
+    def fake_api_post(path, data, files=None, employee_id=None):
+        assert data["certificate[recipient_id]"] == data["certificate[employee_id]"]
+        posts.append((data["certificate[employee_id]"], employee_id, files["certificate[document]"][1].read()))
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "api_post", fake_api_post)
+    monkeypatch.setattr(flask_app.bulk_certificates, "processes", 0) # Render on threads, the pool has its own test
+    return posts
+
+
+def test_bulk_route_issues_to_completers_only(client, rails, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    form = {k: v for k, v in PARAMS.items() if k in ("name", "description", "issued_on", "expiry_date", "course_id")}
+    resp = client.post("/admin/certificates/bulk", data={**form, "zip": "1"})
+    assert resp.status_code == 202
+    assert resp.get_json()["total"] == 2
+
+    flask_app.bulk_certificates.join()
+    batch = client.get(resp.get_json()["status_url"]).get_json()
+    assert batch["status"] == "done"
+    assert sorted(p[:2] for p in rails) == [(1, admin_user["id"]), (3, admin_user["id"])]
+    assert all(p[2].startswith(b"%PDF") for p in rails)
+
+    download = client.get(batch["zip_url"])
+    assert download.status_code == 200
+    assert download.mimetype == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(download.data)) as zf:
+        assert sorted(zf.namelist()) == ["certificate-1-Ann_Lee.pdf", "certificate-3-Bo_Chan.pdf"]
+
+
+def test_bulk_route_requires_admin_and_completers(client, rails, admin_user, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+    assert client.post("/admin/certificates/bulk", data={}).status_code == 403
+
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+    form = {k: v for k, v in PARAMS.items() if k in ("name", "description", "issued_on", "expiry_date")}
+    assert client.post("/admin/certificates/bulk", data={**form, "course_id": "99"}).status_code == 400
+    assert client.get("/admin/certificates/bulk/nope").status_code == 404
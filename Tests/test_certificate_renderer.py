@@ -0,0 +1,70 @@
+import io
+from PIL import Image
+from reportlab.pdfgen import canvas
+from certificate_renderer import CertificateRenderer
+import app as flask_app
+
+
+def params(**overrides):
+    return {
+        "name": "Safety Training",
+        "description": "Awarded for completing the course",
+        "issuer": "Admin User",
+        "issued_on": "2024-01-01",
+        "expiry_date": "2025-01-01",
+        "logo": None,
+        **overrides,
+    }
+
+
+def png(size=(64, 64)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "navy").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_renders_single_page_pdf():
+    pdf = CertificateRenderer().render(params()).getvalue()
+    assert pdf.startswith(b"%PDF")
+    assert b"/Count 1" in pdf
+
+
+def test_logo_is_embedded_and_bad_logo_ignored():
+    renderer = CertificateRenderer()
+    with_logo = renderer.render(params(logo=png())).getvalue()
+    assert b"/Subtype /Image" in with_logo
+
+    broken = renderer.render(params(logo=b"not an image")).getvalue()
+    assert broken.startswith(b"%PDF") and b"/Subtype /Image" not in broken
+
+
+def test_long_text_wraps_within_the_page():
+    renderer = CertificateRenderer()
+    lines = renderer._lines("word " * 200, renderer.description)
+    assert len(lines) > 1
+
+
+def test_footer_is_drawn_on_a_page_after_a_long_description():
+    renderer = CertificateRenderer()
+    drawn = [] # (page, y, text) for every line
+    original = canvas.Canvas.drawCentredString
+
+    def record(pdf, x, y, text, *args, **kwargs):
+        drawn.append((pdf.getPageNumber(), y, text))
+        return original(pdf, x, y, text, *args, **kwargs)
+
+    canvas.Canvas.drawCentredString = record
+    try:
+        pdf = renderer.render(params(description="word " * 700, logo=png())).getvalue()
+    finally:
+        canvas.Canvas.drawCentredString = original
+
+    assert b"/Count 2" in pdf
+    assert all(renderer.bottom <= y <= renderer.height for _, y, _ in drawn)
+    footer = [(page, text) for page, _, text in drawn if text.startswith(("Issued by", "Issued On", "Expiry Date"))]
+    assert [text for _, text in footer] == ["Issued by: Admin User", "Issued On: 2024-01-01", "Expiry Date: 2025-01-01"]
+    assert footer[0][0] == 2
+
+
+def test_app_builds_certificates_with_shared_renderer():
+    assert flask_app.build_certificate_pdf(params()).getvalue().startswith(b"%PDF")
@@ -1,6 +1,8 @@
+import threading
 from io import BytesIO
 from unittest.mock import MagicMock
 import app as flask_app
+from certificate_jobs import CertificateJobs
 
 
 def test_admin_certificates_view(client, monkeypatch, admin_user):
@@ -66,8 +68,13 @@ def test_create_certificate_success(client, monkeypatch, admin_user):
 
     mock_resp = MagicMock()
     mock_resp.status_code = 201
+    uploads = []
 
-    monkeypatch.setattr(flask_app, "api_post", lambda path, data, files=None: mock_resp)
+    def fake_api_post(path, data, files=None, employee_id=None):
+        uploads.append((path, files["certificate[document]"][1].read(), employee_id))
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "api_post", fake_api_post)
 
     data = {
         "name": "Test Cert",
@@ -89,3 +96,63 @@ def test_create_certificate_success(client, monkeypatch, admin_user):
     )
     assert resp.status_code == 302
     assert "/admin/certificates" in resp.headers["Location"]
+
+    flask_app.certificate_jobs.join()
+    assert uploads[0][0] == "certificates"
+    assert uploads[0][1].startswith(b"%PDF")
+    assert uploads[0][2] == admin_user["id"]
+
+
+def test_create_certificate_returns_job_and_status(client, monkeypatch, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    mock_resp = MagicMock()
+    mock_resp.status_code = 422
+    mock_resp.json.return_value = {"errors": ["Course must exist"]}
+
+    monkeypatch.setattr(flask_app, "api_post", lambda path, data, files=None, employee_id=None: mock_resp)
+
+    resp = client.post(
+        "/admin/certificates/create",
+        data={
+            "name": "Test Cert",
+            "description": "A test cert",
+            "issued_on": "2024-01-01",
+            "expiry_date": "2025-01-01",
+            "course_id": "99",
+        },
+        headers={"Accept": "application/json"},
+    )
+    assert resp.status_code == 202
+    status_url = resp.get_json()["status_url"]
+
+    flask_app.certificate_jobs.join()
+    job = client.get(status_url).get_json()
+    assert job["status"] == "failed"
+    assert job["errors"] == ["Course must exist"]
+
+
+def test_certificate_job_status_unknown(client, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    assert client.get("/admin/certificates/jobs/nope").status_code == 404
+
+
+def test_certificate_job_status_requires_admin(client, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    assert client.get("/admin/certificates/jobs/nope").status_code == 403
+
+
+def test_certificate_jobs_drain_on_close():
+    release = threading.Event()
+    jobs = CertificateJobs(lambda params: release.wait(2) and b"%PDF", lambda params, pdf: (True, []), workers=1)
+    first, second = jobs.submit({}), jobs.submit({})
+
+    assert jobs.close(timeout=0.05) is False # Stuck render, shutdown gives up instead of hanging
+    release.set()
+    assert jobs.close(timeout=2) is True
+    assert jobs.status(first)["status"] == jobs.status(second)["status"] == "done"
@@ -0,0 +1,147 @@
+import time
+from unittest.mock import MagicMock
+import pytest
+from flask import g, get_flashed_messages
+import requests
+import api_client
+import app as flask_app
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_threshold_and_half_opens_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+
+    breaker.record_failure("courses")
+    breaker.before_call("courses")  # still closed
+    breaker.record_failure("courses")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("courses")
+    breaker.before_call("enrollments")  # other resources are unaffected
+
+    clock.now = 31
+    breaker.before_call("courses")  # single trial call allowed
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("courses")
+    breaker.record_success("courses")
+    assert breaker.state("courses") == "closed"
+
+
+def test_failed_trial_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure("courses")
+    clock.now = 11
+    breaker.before_call("courses")
+    breaker.record_failure("courses")
+    assert breaker.state("courses") == "open"
+
+
+def test_upstream_sends_default_timeout(monkeypatch, http):
+    seen = {}
+    mock_resp = MagicMock()
+    mock_resp.status_code = 204
+
+    def fake_delete(url, params=None, timeout=None):
+        seen["timeout"] = timeout
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "delete", fake_delete)
+
+    flask_app.api_delete("courses/1")
+    assert seen["timeout"] == api_client.DEFAULT_TIMEOUT
+
+
+def test_open_circuit_skips_upstream(monkeypatch, http):
+    calls = []
+
+    def timing_out(url, **kwargs):
+        calls.append(url)
+        raise requests.exceptions.ReadTimeout("slow")
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", timing_out)
+    monkeypatch.setattr(flask_app.breaker, "failure_threshold", 2)
+
+    for _ in range(4):
+        assert flask_app.api_get("courses") is None
+    assert len(calls) == 2
+
+
+def test_timeout_from_spent_page_budget_leaves_circuit_closed(app, monkeypatch, http):
+    def timing_out(url, **kwargs):
+        raise requests.exceptions.ReadTimeout("slow")
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", timing_out)
+    monkeypatch.setattr(flask_app.breaker, "failure_threshold", 1)
+
+    with app.test_request_context("/"):
+        g.deadline = time.monotonic() + 1 # clamps the read timeout below the default
+        assert flask_app.api_get("courses") is None
+
+    assert flask_app.breaker.state("courses") == "closed"
+    assert 'status="deadline_exceeded"' in flask_app.metrics.registry.render()
+
+
+def test_stale_response_served_with_flash_when_rails_fails(app, monkeypatch, http, employee_user):
+    ok = MagicMock()
+    ok.status_code = 200
+    ok.json.return_value = [{"id": 1, "title": "Cached"}]
+    down = MagicMock()
+    down.status_code = 503
+    responses = [ok, down]
+
+    monkeypatch.setattr(http, "get", lambda url, **kwargs: responses.pop(0))
+    monkeypatch.setattr(flask_app.api_cache, "ttl_for", lambda path: 0.000001)  # expires straight away
+
+    with app.test_request_context("/courses"):
+        flask_app.session["employee"] = employee_user
+        assert flask_app.api_get("courses") == [{"id": 1, "title": "Cached"}]
+        assert flask_app.api_get("courses") == [{"id": 1, "title": "Cached"}]
+        assert get_flashed_messages() == ["The SkillZONE API is not responding, data may be stale."]
+
+
+def test_stale_flash_shown_once_for_a_fan_out(app, monkeypatch, http, employee_user):
+    paths = ["employees", "courses", "enrollments", "certificates"]
+    ok = MagicMock()
+    ok.status_code = 200
+    ok.json.return_value = [{"id": 1}]
+    down = MagicMock()
+    down.status_code = 503
+    rails_up = [True]
+
+    monkeypatch.setattr(http, "get", lambda url, **kwargs: ok if rails_up[0] else down)
+    monkeypatch.setattr(flask_app.api_cache, "ttl_for", lambda path: 0.000001)  # expires straight away
+
+    with app.test_request_context("/admin-dashboard"):
+        flask_app.session["employee"] = employee_user
+        assert flask_app.api_get_many(paths) == [[{"id": 1}]] * 4
+        rails_up[0] = False
+        assert flask_app.api_get_many(paths) == [[{"id": 1}]] * 4 # Every resource falls back to stale data
+        assert get_flashed_messages() == [flask_app.STALE_DATA_MESSAGE]
+
+
+def test_no_stale_fallback_for_client_errors(monkeypatch, http):
+    ok = MagicMock()
+    ok.status_code = 200
+    ok.json.return_value = {"id": 1}
+    missing = MagicMock()
+    missing.status_code = 404
+    responses = [ok, missing]
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", lambda url, **kwargs: responses.pop(0))
+    monkeypatch.setattr(flask_app.api_cache, "ttl_for", lambda path: 0.000001)
+
+    assert flask_app.api_get("courses/1") == {"id": 1}
+    assert flask_app.api_get("courses/1") is None
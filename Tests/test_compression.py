@@ -0,0 +1,80 @@
+import gzip
+import zlib
+import pytest
+from flask import Response
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+import app as flask_app
+import compression
+
+
+def _accept(header):
+    return parse_accept_header(header, Accept)
+
+
+def big_page():
+    return "<tr><td>row</td></tr>" * 200
+
+
+def test_html_gzipped_when_accepted(client, monkeypatch):
+    monkeypatch.setattr(flask_app, "render_template", lambda name, **context: big_page())
+
+    resp = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert gzip.decompress(resp.get_data()).decode() == big_page()
+    assert int(resp.headers["Content-Length"]) == len(resp.get_data())
+
+
+def test_identity_without_accept_encoding_or_below_threshold(client, monkeypatch):
+    monkeypatch.setattr(flask_app, "render_template", lambda name, **context: big_page())
+    assert "Content-Encoding" not in client.get("/").headers
+
+    monkeypatch.setattr(flask_app, "render_template", lambda name, **context: "<p>tiny</p>")
+    assert "Content-Encoding" not in client.get("/", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_refused_encoding_is_not_used(client, monkeypatch):
+    monkeypatch.setattr(flask_app, "render_template", lambda name, **context: big_page())
+    resp = client.get("/", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_brotli_preferred_when_installed():
+    brotli = pytest.importorskip("brotli")
+    resp = compression.compress_response(Response(big_page(), mimetype="text/html"), _accept("gzip, br"))
+    assert resp.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(resp.get_data()).decode() == big_page()
+
+
+def test_streamed_response_stays_streamed():
+    resp = Response((chunk for chunk in [big_page(), big_page()]), mimetype="text/html")
+    resp = compression.compress_response(resp, _accept("gzip"))
+
+    assert resp.is_streamed
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(b"".join(resp.response)).decode() == big_page() * 2
+
+
+def test_streamed_output_is_flushed_as_it_renders():
+    rows = ("<tr><td>row %d</td></tr>" % i for i in range(20000)) # ~450 KB of highly compressible HTML
+    stream = compression._compress_stream(rows, "gzip", flush_every=16384)
+
+    # The first real output (beyond the gzip header) arrives after one flush interval, decodable on its own
+    decoder = zlib.decompressobj(31)
+    decoded = b""
+    for out in stream:
+        decoded += decoder.decompress(out)
+        if decoded:
+            break
+    assert 16384 <= len(decoded) < 20000
+    assert decoded.startswith(b"<tr><td>row 0</td></tr>")
+
+
+def test_files_and_binary_types_left_alone():
+    pdf = Response(b"%PDF" * 500, mimetype="application/pdf")
+    assert "Content-Encoding" not in compression.compress_response(pdf, _accept("gzip")).headers
+
+    passthrough = Response(big_page(), mimetype="text/html", direct_passthrough=True)
+    assert "Content-Encoding" not in compression.compress_response(passthrough, _accept("gzip")).headers
@@ -0,0 +1,69 @@
+import json
+import app as flask_app
+from conditional_get import validators
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode() if body is not None else b""
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def test_revalidates_with_etag_and_reuses_body_on_304(monkeypatch, http):
+    sent_headers = []
+    responses = [
+        FakeResponse(200, [{"id": 1}], {"ETag": '"v1"'}),
+        FakeResponse(304),
+    ]
+
+    def fake_get(url, params=None, headers=None, **kwargs):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", fake_get)
+    monkeypatch.setattr(flask_app.api_cache, "ttl_for", lambda path: 0)  # force a trip upstream every time
+
+    first = flask_app.api_get("certificates")
+    second = flask_app.api_get("certificates")
+
+    assert second is first
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+
+    stats = validators.stats()["background"]
+    assert stats["full"] == 1
+    assert stats["not_modified"] == 1
+    assert stats["bytes_saved"] == len(b'[{"id": 1}]')
+
+
+def test_last_modified_is_sent_back(monkeypatch, http):
+    sent_headers = []
+    responses = [
+        FakeResponse(200, [], {"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}),
+        FakeResponse(304),
+    ]
+
+    def fake_get(url, params=None, headers=None, **kwargs):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", fake_get)
+    monkeypatch.setattr(flask_app.api_cache, "ttl_for", lambda path: 0)
+
+    flask_app.api_get("enrollments")
+    assert flask_app.api_get("enrollments") == []
+    assert sent_headers[1] == {"If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+
+def test_304_without_stored_body_refetches(monkeypatch, http):
+    responses = [FakeResponse(304), FakeResponse(200, {"id": 3})]
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", lambda url, params=None, headers=None, **kwargs: responses.pop(0))
+
+    assert flask_app.api_get("courses/3") == {"id": 3}
@@ -0,0 +1,122 @@
+from unittest.mock import MagicMock
+
+import app as flask_app
+from course_catalog import CourseCatalog
+
+COURSES = [
+    {"id": 1, "title": "Networking", "department": "IT", "start_date": "2024-03-01"},
+    {"id": 2, "title": "Payroll", "department": "HR", "start_date": "2024-01-01"},
+    {"id": 3, "title": "Linux", "department": "IT", "start_date": "2024-02-01"},
+    {"id": 4, "title": "Ansible", "department": "IT", "start_date": None},
+]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def counting_loader(courses=COURSES):
+    calls = []
+
+    def loader(department):
+        calls.append(department)
+        return courses
+    return loader, calls
+
+
+def titles(courses):
+    return [c["title"] for c in courses]
+
+
+def test_departments_are_indexed_sorted_and_reused():
+    clock = Clock()
+    catalog = CourseCatalog(ttl=60, clock=clock)
+    loader, calls = counting_loader()
+
+    assert titles(catalog.for_department("IT", loader)) == ["Linux", "Networking", "Ansible"]
+    assert titles(catalog.for_department("HR", loader)) == ["Payroll"]
+    assert catalog.for_department("Sales", loader) == ()
+    assert catalog.for_department(None, loader) == ()
+    assert calls == [None] # One full fetch indexes every department
+
+    clock.now = 61
+    catalog.for_department("IT", loader)
+    assert calls == [None, None]
+
+
+def test_failed_load_keeps_what_is_indexed():
+    clock = Clock()
+    catalog = CourseCatalog(ttl=60, clock=clock)
+    catalog.for_department("IT", counting_loader()[0])
+    clock.now = 61
+    assert len(catalog.for_department("IT", lambda department: None)) == 3
+
+
+def test_update_moves_course_between_departments_and_remove():
+    catalog = CourseCatalog()
+    loader, calls = counting_loader()
+    catalog.for_department("IT", loader)
+
+    catalog.update(1, {"department": "HR", "start_date": "2023-12-01"})
+    assert titles(catalog.for_department("HR", loader)) == ["Networking", "Payroll"]
+    assert titles(catalog.for_department("IT", loader)) == ["Linux", "Ansible"]
+    assert COURSES[0]["department"] == "IT" # Cached records are copied, never mutated
+
+    catalog.remove(3)
+    catalog.upsert({"id": 5, "title": "Kubernetes", "department": "IT", "start_date": "2024-01-15"})
+    assert titles(catalog.for_department("IT", loader)) == ["Kubernetes", "Ansible"]
+    assert calls == [None]
+
+
+def test_upstream_filter_fetches_one_department():
+    catalog = CourseCatalog(upstream_filter=True)
+    loader, calls = counting_loader() # A Rails that ignores the filter still only indexes the slice
+
+    assert titles(catalog.for_department("HR", loader)) == ["Payroll"]
+    assert catalog.for_department("HR", loader)
+    assert calls == ["HR"]
+    catalog.for_department("IT", loader)
+    assert calls == ["HR", "IT"]
+
+
+def test_courses_route_passes_department_upstream(client, monkeypatch, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    paths = []
+    monkeypatch.setattr(flask_app, "api_get", lambda path: paths.append(path) or [c for c in COURSES if c["department"] == "IT"])
+    monkeypatch.setattr(flask_app.course_catalog, "upstream_filter", True)
+
+    resp = client.get("/courses")
+    assert resp.status_code == 200
+    assert paths == ["courses?department=IT"]
+    assert "Linux" in resp.data.decode()
+
+
+def test_edit_course_refreshes_catalog_without_refetch(client, monkeypatch, admin_user, employee_user):
+    paths = []
+    monkeypatch.setattr(flask_app, "api_get", lambda path: paths.append(path) or COURSES)
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    monkeypatch.setattr(flask_app, "api_patch", lambda path, data: mock_resp)
+
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+    client.get("/courses")
+
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+    client.post("/course/edit/2", data={
+        "title": "Payroll for IT", "description": "Desc", "duration": "30", "capacity": "5", "level": "Beginner",
+        "start_date": "2024-01-01", "end_date": "2024-02-01", "youtube_url": "", "department": "IT",
+    })
+
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+    body = client.get("/courses").data.decode()
+    assert "Payroll for IT" in body
+    assert paths == ["courses"]
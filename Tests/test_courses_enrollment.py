@@ -196,8 +196,11 @@ def test_mark_completed_ok(client, monkeypatch, employee_user):
     mock_resp.status_code = 200
 
     monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+    expired = []
     monkeypatch.setattr(flask_app, "api_patch", lambda path, data: mock_resp)
+    monkeypatch.setattr(flask_app.admin_summary, "expire", lambda: expired.append(1))
 
     resp = client.post("/mark-completed/1", follow_redirects=False)
     assert resp.status_code == 302
     assert "/courses" in resp.headers["Location"]
+    assert expired == [1] # Completed / active counts on the admin dashboard moved
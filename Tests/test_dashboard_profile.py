@@ -101,7 +101,7 @@ def test_admin_dashboard_ok(client, monkeypatch, admin_user):
     with client.session_transaction() as sess:
         sess["employee"] = admin_user
 
-    def fake_api_get(path):
+    def fake_api_get(path, employee_id=None):
         if path == "employees":
             return []
         if path == "courses":
@@ -116,3 +116,83 @@ def test_admin_dashboard_ok(client, monkeypatch, admin_user):
 
     resp = client.get("/admin-dashboard")
     assert resp.status_code == 200
+
+
+def test_admin_dashboard_serves_cached_summary(client, monkeypatch, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    calls = []
+
+    def fake_api_get(path, employee_id=None):
+        calls.append((path, employee_id))
+        if path == "enrollments":
+            return [{"id": 1, "status": "completed"}, {"id": 2, "status": "active"}]
+        return [{"id": 1}]
+
+    monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+
+    # First visit renders straight away and refreshes the summary in the background
+    resp = client.get("/admin-dashboard")
+    assert resp.status_code == 200
+    assert b"summary: None" in resp.data
+    flask_app.admin_summary.wait()
+    assert sorted(calls) == sorted((p, admin_user["id"]) for p in ["employees", "courses", "enrollments", "certificates"])
+
+    # Later visits use the cached counts without calling Rails
+    calls.clear()
+    resp = client.get("/admin-dashboard")
+    assert b"'completion_rate': 50" in resp.data
+    assert calls == []
+
+
+def test_admin_summary_is_kept_per_admin_and_survives_progress_writes(monkeypatch):
+    from admin_summary import SummaryCache
+
+    computed = []
+    cache = SummaryCache(lambda employee_id: computed.append(employee_id) or {"scope": employee_id})
+    cache.get(2)
+    cache.wait()
+    assert cache.get(2) == {"scope": 2}
+    assert cache.get(3) is None # Another admin never sees a summary computed with admin 2's id
+    cache.wait()
+    assert cache.get(3) == {"scope": 3}
+    assert computed == [2, 3]
+
+    monkeypatch.setattr(flask_app, "admin_summary", cache)
+    monkeypatch.setattr(flask_app, "upstream", lambda method, path, **kwargs: MagicMock(status_code=200))
+    flask_app.api_patch("enrollments/1", {"enrollment": {"progress": 40}}, employee_id=2) # A progress flush
+    cache.get(2)
+    cache.wait()
+    assert computed == [2, 3]
+
+    flask_app.api_post("enrollments", {"enrollment": {"course_id": 1}}, employee_id=2) # Record counts change
+    cache.get(2)
+    cache.wait()
+    assert computed == [2, 3, 2]
+
+
+def test_dashboard_hides_colleagues_bulk_certificates(client, monkeypatch, employee_user, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    enrollments = [{"id": 1, "employee": {"id": employee_user["id"]}, "course": {"id": 10, "title": "Course A"}, "status": "completed"}]
+    certificates = [
+        {"id": 5, "name": "Course level", "course": {"id": 10}, "employee_id": admin_user["id"]},
+        {"id": 6, "name": "Mine", "course": {"id": 10}, "employee_id": str(employee_user["id"]), "recipient_id": str(employee_user["id"])},
+        {"id": 7, "name": "Colleague", "course": {"id": 10}, "employee_id": "3", "recipient_id": "3"},
+        {"id": 8, "name": "Colleague nested", "course": {"id": 10}, "employee": {"id": 4, "admin": False}},
+    ]
+    data = {"enrollments": enrollments, "certificates": certificates}
+    fetched = []
+
+    def fake_api_get(path):
+        fetched.append(path)
+        return data[path]
+
+    monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+
+    body = client.get("/dashboard").data.decode()
+    assert "Course level" in body and "Mine" in body
+    assert "Colleague" not in body
+    assert "employees" not in fetched # Employees may not be allowed to list their colleagues
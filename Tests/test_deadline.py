@@ -0,0 +1,75 @@
+import threading
+import time
+from unittest.mock import MagicMock
+import pytest
+from flask import g
+import app as flask_app
+import deadline
+import metrics
+
+
+def test_clamp_timeout_shrinks_to_remaining_budget():
+    assert deadline.clamp_timeout((3.05, 20), None) == (3.05, 20)
+    assert deadline.clamp_timeout((3.05, 20), 12, clock=lambda: 10) == (2, 2)
+    with pytest.raises(deadline.DeadlineExceeded):
+        deadline.clamp_timeout((3.05, 20), 10, clock=lambda: 10)
+
+
+def test_budget_for_uses_per_route_override(monkeypatch):
+    monkeypatch.setattr(deadline, "REQUEST_DEADLINES", {"admin_enrollments": 4.0})
+    assert deadline.budget_for("admin_enrollments") == 4.0
+    assert deadline.budget_for("dashboard") == deadline.REQUEST_DEADLINE
+
+
+def test_upstream_timeout_limited_by_request_deadline(app, monkeypatch, http):
+    seen = {}
+    mock_resp = MagicMock()
+    mock_resp.status_code = 204
+
+    def fake_delete(url, params=None, timeout=None):
+        seen["timeout"] = timeout
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "delete", fake_delete)
+
+    with app.test_request_context("/"):
+        g.deadline = time.monotonic() + 1
+        flask_app.api_delete("courses/1")
+
+    assert all(part <= 1 for part in seen["timeout"])
+
+
+def test_spent_deadline_skips_rails(app, monkeypatch, http):
+    calls = []
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", lambda url, **kwargs: calls.append(url))
+
+    with app.test_request_context("/"):
+        g.deadline = time.monotonic() - 1
+        assert flask_app.api_get("courses") is None
+
+    assert calls == []
+    assert 'status="deadline_exceeded"' in metrics.registry.render()
+
+
+def test_api_get_many_abandons_calls_past_deadline(app, monkeypatch):
+    release = threading.Event()
+
+    def fake_api_get(path):
+        if path == "enrollments":
+            release.wait(2)  # stuck upstream
+        return [path]
+
+    monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+
+    with app.test_request_context("/"):
+        g.deadline = time.monotonic() + 0.2
+        started = time.monotonic()
+        results = flask_app.api_get_many(["employees", "enrollments", "courses"])
+        elapsed = time.monotonic() - started
+    release.set()
+
+    assert results == [["employees"], None, ["courses"]]
+    assert elapsed < 1
+    assert "skillzone_upstream_abandoned_total" in metrics.registry.render()
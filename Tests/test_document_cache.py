@@ -0,0 +1,152 @@
+import io
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+import app as flask_app
+import metrics
+from document_cache import DocumentCache
+
+
+def downloader(bodies, calls):
+    def download(url, writer):
+        calls.append(url)
+        writer.write(bodies[url][:10])
+        writer.write(bodies[url][10:])
+    return download
+
+
+def test_first_access_fills_cache_then_hits(tmp_path):
+    cache = DocumentCache(str(tmp_path))
+    calls = []
+    download = downloader({"/a.pdf": b"%PDF-1.4 certificate a"}, calls)
+
+    path, digest = cache.get("/a.pdf", download)
+    assert open(path, "rb").read() == b"%PDF-1.4 certificate a"
+    assert os.path.basename(path) == digest + ".pdf"
+    assert cache.get("/a.pdf", download) == (path, digest)
+    assert calls == ["/a.pdf"]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_same_content_under_two_urls_is_stored_once(tmp_path):
+    cache = DocumentCache(str(tmp_path))
+    download = downloader({"/a.pdf": b"%PDF same", "/b.pdf": b"%PDF same"}, [])
+    assert cache.get("/a.pdf", download) == cache.get("/b.pdf", download)
+    assert cache.total_bytes() == len(b"%PDF same")
+
+
+def test_evicts_least_recently_used_past_size_bound(tmp_path):
+    cache = DocumentCache(str(tmp_path), max_bytes=250)
+    bodies = {f"/{n}.pdf": bytes([n]) * 100 for n in range(3)}
+    calls = []
+    download = downloader(bodies, calls)
+
+    first, _ = cache.get("/0.pdf", download)
+    cache.get("/1.pdf", download)
+    cache.get("/0.pdf", download) # 0 is now more recent than 1
+    cache.get("/2.pdf", download)
+
+    assert cache.evictions == 1
+    assert os.path.exists(first)
+    assert cache.total_bytes() == 200
+    cache.get("/1.pdf", download) # Evicted, downloaded again
+    assert calls == ["/0.pdf", "/1.pdf", "/2.pdf", "/1.pdf"]
+
+
+def test_failed_download_leaves_nothing_behind(tmp_path):
+    cache = DocumentCache(str(tmp_path))
+
+    def broken(url, writer):
+        writer.write(b"%PDF partial")
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        cache.get("/a.pdf", broken)
+    assert cache.total_bytes() == 0
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_another_worker_sees_files_on_disk(tmp_path):
+    path, digest = DocumentCache(str(tmp_path)).get("/a.pdf", downloader({"/a.pdf": b"%PDF a"}, []))
+    assert DocumentCache(str(tmp_path)).total_bytes() == len(b"%PDF a")
+
+
+@pytest.fixture
+def documents(monkeypatch, tmp_path):
+    pdf = b"%PDF-1.4 " + b"x" * 2000
+    calls = []
+    cache = DocumentCache(str(tmp_path))
+    monkeypatch.setattr(flask_app, "documents", cache)
+    monkeypatch.setattr(flask_app, "api_get", lambda path: {"id": 5, "document_url": "/rails/blobs/5.pdf"} if path == "certificates/5" else None)
+    monkeypatch.setattr(flask_app, "download_document", downloader({"/rails/blobs/5.pdf": pdf}, calls))
+    return pdf, calls
+
+
+def test_document_route_serves_conditional_and_range_requests(client, documents, employee_user):
+    pdf, calls = documents
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    resp = client.get("/certificates/5/document")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/pdf"
+    assert resp.data == pdf
+    assert "Content-Encoding" not in resp.headers
+    etag = resp.headers["ETag"]
+
+    assert client.get("/certificates/5/document", headers={"If-None-Match": etag}).status_code == 304
+
+    partial = client.get("/certificates/5/document", headers={"Range": "bytes=0-99"})
+    assert partial.status_code == 206
+    assert partial.data == pdf[:100]
+    assert partial.headers["Content-Range"] == f"bytes 0-99/{len(pdf)}"
+    assert calls == ["/rails/blobs/5.pdf"]
+
+
+def test_document_route_falls_back_to_rails(client, documents, monkeypatch, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    def failing(url, writer):
+        raise ConnectionError("storage down")
+
+    monkeypatch.setattr(flask_app, "download_document", failing)
+    resp = client.get("/certificates/5/document")
+    assert resp.status_code == 302
+    assert resp.headers["Location"] == f"{flask_app.RAILS_API_URL}/rails/blobs/5.pdf"
+
+    assert client.get("/certificates/6/document").status_code == 404
+
+
+def test_document_route_requires_login(client, documents):
+    resp = client.get("/certificates/5/document")
+    assert resp.status_code == 302
+    assert "/login" in resp.headers["Location"]
+
+
+def test_download_goes_through_upstream(monkeypatch, http):
+    seen = []
+    ok, failed = MagicMock(status_code=200), MagicMock(status_code=503)
+    ok.iter_content.return_value = [b"%PDF", b"-1.4"]
+    failed.raise_for_status.side_effect = RuntimeError("503")
+
+    def get(url, stream=False, timeout=None, **kwargs):
+        seen.append((url, stream, timeout))
+        return failed if "broken" in url else ok
+
+    monkeypatch.setattr(http, "get", get)
+    monkeypatch.setattr(flask_app.breaker, "failure_threshold", 1)
+
+    out = io.BytesIO()
+    flask_app.download_document("/rails/blobs/abc123.pdf", out)
+    assert out.getvalue() == b"%PDF-1.4"
+    assert seen == [(f"{flask_app.RAILS_API_URL}/rails/blobs/abc123.pdf", True, flask_app.api_client.DEFAULT_TIMEOUT)]
+    assert 'path="documents"' in metrics.registry.render() # One label, not one per blob token
+
+    with pytest.raises(RuntimeError):
+        flask_app.download_document("https://storage.example.com/broken.pdf", out)
+    assert seen[-1][0] == "https://storage.example.com/broken.pdf"
+    assert flask_app.breaker.state("documents") == "open"
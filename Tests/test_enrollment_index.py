@@ -0,0 +1,142 @@
+from unittest.mock import MagicMock
+import app as flask_app
+from enrollment_index import EnrollmentIndex, group_by_employee
+
+
+def make_enrollment(id, employee_id, course_id, **fields):
+    return {"id": id, "employee": {"id": employee_id}, "course": {"id": course_id}, **fields}
+
+
+def test_find_and_group_by_employee():
+    enrollments = [
+        make_enrollment(1, 1, 10),
+        make_enrollment(2, 1, 20),
+        make_enrollment(3, 2, 10),
+    ]
+    index = EnrollmentIndex()
+
+    assert index.find(1, 20, lambda: enrollments)["id"] == 2
+    assert index.find(2, 20, lambda: enrollments) is None
+    assert sorted(e["id"] for e in index.for_employee(1, lambda: enrollments)) == [1, 2]
+
+
+def test_loader_only_called_when_stale():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [make_enrollment(1, 1, 10)]
+
+    index = EnrollmentIndex(ttl=60)
+    index.find(1, 10, loader)
+    index.find(1, 10, loader)
+    index.for_employee(1, loader)
+    assert len(calls) == 1
+
+    index.expire(1)
+    index.find(1, 10, loader)
+    assert len(calls) == 2
+
+
+def test_incremental_update_and_remove():
+    original = make_enrollment(1, 1, 10, progress=0)
+    index = EnrollmentIndex()
+    index.load([original])
+
+    index.update(1, {"progress": 40})
+    assert index.find(1, 10, lambda: [])["progress"] == 40
+    assert original["progress"] == 0  # fetched record is never mutated
+
+    index.remove(1)
+    assert index.for_employee(1, lambda: []) == []
+
+
+def test_failed_load_is_retried():
+    index = EnrollmentIndex()
+    assert index.find(1, 10, lambda: None) is None
+    assert index.find(1, 10, lambda: [make_enrollment(1, 1, 10)])["id"] == 1
+
+
+def test_miss_on_fresh_index_reloads_once():
+    rails = [make_enrollment(1, 1, 10)]
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return list(rails)
+
+    index = EnrollmentIndex(ttl=60)
+    assert index.find(1, 10, loader)["id"] == 1
+    rails.append(make_enrollment(2, 1, 20)) # Enrolled through another worker
+
+    assert index.find(1, 20, loader)["id"] == 2
+    assert len(calls) == 2
+    assert index.find(1, 30, loader) is None
+    assert len(calls) == 3 # A real miss costs one reload, hits stay cached
+    index.find(1, 10, loader)
+    assert len(calls) == 3
+
+
+def test_miss_reload_skips_api_cache(monkeypatch, http):
+    rails = [make_enrollment(1, 1, 10)]
+    calls = []
+
+    def get(url, params=None, **kwargs):
+        calls.append(url)
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.headers = {}
+        resp.json.return_value = list(rails)
+        return resp
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", get)
+
+    assert flask_app.find_enrollment(1, 10)["id"] == 1
+    rails.append(make_enrollment(2, 1, 20)) # Enrolled through another worker, the cached list predates it
+
+    assert flask_app.find_enrollment(1, 20)["id"] == 2
+    assert len(calls) == 2
+    assert flask_app.api_get("enrollments") == rails # The reload refreshed the cached copy too
+
+
+def test_update_progress_reuses_index(client, monkeypatch, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    calls = []
+
+    def fake_api_get(path):
+        calls.append(path)
+        return [make_enrollment(10, employee_user["id"], 1, progress=0)]
+
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+
+    monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+    monkeypatch.setattr(flask_app, "api_patch", lambda path, data: mock_resp)
+
+    for progress in (5, 10, 15):
+        assert client.post("/update-progress/1", json={"progress": progress}).status_code == 200
+
+    assert calls == ["enrollments"]
+    assert flask_app.find_enrollment(employee_user["id"], 1)["progress"] == 15
+
+
+def test_group_by_employee_accepts_nested_and_flat_ids():
+    nested = make_enrollment(1, 7, 1)
+    flat = {"id": 2, "employee_id": 7, "course_id": 2}
+    other = make_enrollment(3, 8, 1)
+
+    assert group_by_employee([nested, flat, other]) == {7: [nested, flat], 8: [other]}
+
+
+def test_manage_employees_passes_grouped_enrollments(client, monkeypatch, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    enrollments = [make_enrollment(1, 5, 1), make_enrollment(2, 5, 2), make_enrollment(3, 6, 1)]
+    monkeypatch.setattr(flask_app, "api_get", lambda path: enrollments if path == "enrollments" else [{"id": 5}, {"id": 6}])
+
+    body = client.get("/manage_employees").get_data(as_text=True)
+    assert f"enrollments_by_employee: {group_by_employee(enrollments)}" in body
@@ -0,0 +1,85 @@
+import io
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+import app as flask_app
+from logo_cache import LogoCache, normalize
+
+
+def image_bytes(size, mode="RGB", fmt="PNG", **options):
+    buffer = io.BytesIO()
+    Image.new(mode, size, "navy").save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def test_normalize_downscales_and_strips_metadata():
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    original = image_bytes((3000, 1500), fmt="JPEG", quality=100, exif=exif)
+
+    logo = normalize(original, pixels=240)
+    with Image.open(io.BytesIO(logo.data)) as image:
+        assert image.format == "JPEG"
+        assert image.size == (240, 120)
+        assert "exif" not in image.info
+    assert logo.mimetype == "image/jpeg" and logo.extension == ".jpg"
+    assert len(logo.data) < len(original)
+
+
+def test_normalize_keeps_transparency_as_png():
+    logo = normalize(image_bytes((1000, 1000), mode="RGBA"), pixels=240)
+    with Image.open(io.BytesIO(logo.data)) as image:
+        assert (image.format, image.mode, image.size) == ("PNG", "RGBA", (240, 240))
+
+
+def test_normalize_leaves_normalized_logo_untouched():
+    logo = normalize(image_bytes((800, 800), fmt="JPEG"), pixels=240)
+    assert normalize(logo.data, pixels=240).data == logo.data
+
+
+def test_cache_processes_each_logo_once():
+    cache = LogoCache(max_entries=4)
+    original = image_bytes((1200, 1200))
+
+    first = cache.get(original)
+    assert cache.get(original) is first
+    assert cache.get(first.data) is first # Normalized bytes sent back (e.g. to a render process) are a hit
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cache_passes_through_unreadable_data_and_evicts():
+    cache = LogoCache(max_entries=2)
+    assert cache.get(b"not an image") == (b"not an image", None, None)
+
+    for colour in range(3):
+        cache.get(image_bytes((10 + colour, 10)))
+    assert len(cache._entries) <= 2
+
+
+def test_update_certificate_uploads_normalized_logo(client, monkeypatch, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    sent = {}
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+
+    def fake_api_patch(path, data, files=None, employee_id=None):
+        sent.update(files)
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "api_patch", fake_api_patch)
+
+    big = image_bytes((2000, 2000))
+    resp = client.post(
+        "/certificate/update/1",
+        data={"name": "Cert", "issued_on": "2024-01-01", "logo": (io.BytesIO(big), "logo.png")},
+        content_type="multipart/form-data",
+    )
+    assert resp.status_code == 302
+
+    filename, data, mimetype = sent["certificate[document]"]
+    assert (filename, mimetype) == ("logo.jpg", "image/jpeg")
+    with Image.open(io.BytesIO(data)) as image:
+        assert max(image.size) <= 240
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+import app as flask_app
+import metrics
+
+
+def test_normalize_path():
+    assert metrics.normalize_path("courses/12") == "courses/:id"
+    assert metrics.normalize_path("enrollments") == "enrollments"
+    assert metrics.normalize_path("certificates/3/document") == "certificates/:id/document"
+
+
+def test_histogram_exposition():
+    registry = metrics.Registry(buckets=(0.1, 1.0))
+    registry.histogram("t_seconds", "Test.")
+    registry.observe("t_seconds", {"route": "x"}, 0.5)
+
+    text = registry.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{route="x",le="0.1"} 0' in text
+    assert 't_seconds_bucket{route="x",le="1.0"} 1' in text
+    assert 't_seconds_bucket{route="x",le="+Inf"} 1' in text
+    assert 't_seconds_count{route="x"} 1' in text
+
+
+def test_metrics_endpoint_records_routes_and_upstream_calls(client, monkeypatch, http, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = [{"id": 1, "title": "IT Course", "department": "IT"}]
+    mock_resp.content = b'[{"id": 1, "title": "IT Course", "department": "IT"}]'
+
+    monkeypatch.setattr(http, "get", lambda url, params=None, **kwargs: mock_resp)
+
+    assert client.get("/courses").status_code == 200
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    text = resp.data.decode()
+    assert 'skillzone_http_requests_total{method="GET",route="courses",status="200"} 1' in text
+    assert 'skillzone_upstream_requests_total{method="GET",path="courses",route="courses",status="200"} 1' in text
+    assert f'skillzone_upstream_response_bytes_total{{path="courses",route="courses"}} {len(mock_resp.content)}' in text
+    assert 'skillzone_upstream_decode_seconds_count{path="courses",route="courses"} 1' in text
+    assert 'skillzone_api_cache_events_total{event="misses"} 1' in text
+
+
+def test_upstream_errors_are_counted(monkeypatch, http):
+    def boom(*args, **kwargs):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "delete", boom)
+
+    assert flask_app.api_delete("courses/4") is None
+    assert 'path="courses/:id",route="background",status="error"' in metrics.registry.render()
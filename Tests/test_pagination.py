@@ -0,0 +1,84 @@
+from flask import render_template
+from werkzeug.datastructures import MultiDict
+import app as flask_app
+import api_cache
+from Benchmarks.run import use_repo_templates
+from pagination import Pager
+
+
+def test_pager_slices_locally():
+    pager = Pager.from_args(MultiDict({"page": "2", "per_page": "2"}))
+    page = pager.page_of(list(range(5)))
+
+    assert pager.path("enrollments") == "enrollments"
+    assert page.items == [2, 3]
+    assert (page.pages, page.has_prev, page.has_next) == (3, True, True)
+
+
+def test_pager_bad_and_oversized_args():
+    pager = Pager.from_args(MultiDict({"page": "-3", "per_page": "100000"}))
+    assert pager.page == 1
+    assert pager.per_page == 500
+
+
+def test_pager_asks_rails_when_supported():
+    pager = Pager(page=3, per_page=20, rails_pagination=True)
+    page = pager.page_of(list(range(20)))
+
+    assert pager.path("enrollments") == "enrollments?page=3&per_page=20"
+    assert page.total is None and page.has_next
+    assert not pager.page_of(list(range(5))).has_next
+
+
+def test_show_all_never_asks_rails_for_a_page():
+    pager = Pager(show_all=True, rails_pagination=True)
+    page = pager.page_of(list(range(120)))
+
+    assert pager.path("enrollments") == "enrollments"
+    assert len(page.items) == 120 and not page.has_next
+
+
+def test_admin_enrollments_renders_one_page(client, monkeypatch, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    enrollments = [{"id": i} for i in range(1, 8)]
+    monkeypatch.setattr(flask_app, "api_get", lambda path: enrollments if path == "enrollments" else [])
+
+    body = client.get("/admin/enrollments?page=2&per_page=3").get_data(as_text=True)
+    assert "enrollments: [{'id': 4}, {'id': 5}, {'id': 6}]" in body
+    assert "streamed" not in body
+
+
+def test_admin_list_show_all_is_streamed(client, monkeypatch, admin_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = admin_user
+
+    monkeypatch.setattr(flask_app, "api_get", lambda path: [{"id": i} for i in range(80)])
+
+    body = client.get("/manage-courses?all=1").get_data(as_text=True)
+    assert "streamed: True" in body
+    assert "{'id': 79}" in body
+
+
+def test_paged_cache_entries_invalidated_with_listing():
+    cache = api_cache.ApiCache()
+    cache.set("enrollments?page=2&per_page=50", 1, [{"id": 51}])
+    cache.set("courses?page=1&per_page=50", 1, [{"id": 1}])
+
+    cache.invalidate("courses/1")
+    assert cache.get("courses?page=1&per_page=50", 1) is api_cache.MISS
+    assert cache.get("enrollments?page=2&per_page=50", 1) is api_cache.MISS  # dependent of courses
+
+
+def test_empty_page_past_the_end_still_links_back(monkeypatch, admin_user):
+    monkeypatch.setattr(flask_app.app, "jinja_loader", flask_app.app.jinja_loader)
+    use_repo_templates()
+    page = Pager(page=5, per_page=2).page_of(list(range(3))) # 2 pages, ?page=5 is empty
+
+    with flask_app.app.test_request_context("/manage-courses?page=5&per_page=2"):
+        html = render_template("Manage_course.html", courses=page.items, page=page, employee=admin_user)
+
+    assert "No courses available." in html
+    assert "Page 5 of 2" in html
+    assert "page=2" in html and "Previous" in html
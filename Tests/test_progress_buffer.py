@@ -0,0 +1,130 @@
+from unittest.mock import MagicMock
+import app as flask_app
+from progress_buffer import ProgressBuffer
+
+
+def test_keeps_highest_progress_per_enrollment():
+    writes = []
+    buffer = ProgressBuffer(lambda eid, progress, emp: writes.append((eid, progress, emp)) or True)
+    buffer.add(10, 5, 1)
+    buffer.add(10, 15, 1)
+    buffer.add(10, 10, 1)  # late, lower value is ignored
+    buffer.add(11, 50, 2)
+
+    assert buffer.pending() == {10: 15, 11: 50}
+    buffer.flush()
+    assert sorted(writes) == [(10, 15, 1), (11, 50, 2)]
+    assert buffer.pending() == {}
+
+
+def test_flush_single_enrollment():
+    writes = []
+    buffer = ProgressBuffer(lambda eid, progress, emp: writes.append(eid) or True)
+    buffer.add(10, 5, 1)
+    buffer.add(11, 5, 1)
+
+    buffer.flush(10)
+    assert writes == [10]
+    assert buffer.pending() == {11: 5}
+
+
+def test_failed_write_is_retried_then_dropped():
+    attempts = []
+    buffer = ProgressBuffer(lambda eid, progress, emp: attempts.append(eid) and False, retries=2)
+    buffer.add(10, 5, 1)
+
+    buffer.flush()
+    assert buffer.pending() == {10: 5}
+    buffer.flush()
+    assert buffer.pending() == {}
+    assert len(attempts) == 2
+
+
+def test_close_flushes_background_thread():
+    writes = []
+    buffer = ProgressBuffer(lambda eid, progress, emp: writes.append(progress) or True, interval=60)
+    buffer.add(10, 40, 1)
+    buffer.close()
+    assert writes == [40]
+
+
+def test_update_progress_acks_without_upstream_patch(client, monkeypatch, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    enrollment = {"id": 10, "employee": {"id": employee_user["id"]}, "course": {"id": 1}, "progress": 0}
+    patches = []
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+
+    def fake_api_patch(path, data, employee_id=None):
+        patches.append((path, data, employee_id))
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "api_get", lambda path, **kwargs: enrollment if path == "enrollments/10" else [enrollment])
+    monkeypatch.setattr(flask_app, "api_patch", fake_api_patch)
+
+    client.post("/update-progress/1", json={"progress": 20})
+    client.post("/update-progress/1", json={"progress": 25})
+    assert patches == []
+
+    # Completing the course writes buffered progress first, then the completion
+    client.post("/mark-completed/1")
+    assert patches[0] == ("enrollments/10", {"enrollment": {"progress": 25}}, employee_user["id"])
+    assert patches[1][1]["enrollment"]["status"] == "completed"
+
+
+def test_failed_flush_never_lands_after_completion(client, monkeypatch, employee_user):
+    with client.session_transaction() as sess:
+        sess["employee"] = employee_user
+
+    enrollment = {"id": 10, "employee": {"id": employee_user["id"]}, "course": {"id": 1}, "progress": 0, "status": "in_progress"}
+    writes = []
+    ok_resp, failed_resp = MagicMock(), MagicMock()
+    ok_resp.status_code, failed_resp.status_code = 200, 503
+
+    def fake_api_patch(path, data, employee_id=None):
+        writes.append(data["enrollment"])
+        if "status" in data["enrollment"]:
+            return ok_resp
+        return failed_resp # Rails hiccups on the buffered progress write
+
+    monkeypatch.setattr(flask_app, "api_get", lambda path, **kwargs: enrollment if path == "enrollments/10" else [enrollment])
+    monkeypatch.setattr(flask_app, "api_patch", fake_api_patch)
+
+    client.post("/update-progress/1", json={"progress": 60})
+    client.post("/mark-completed/1")
+    client.post("/update-progress/1", json={"progress": 70}) # Player tick arriving after completion
+    flask_app.progress_buffer.flush()
+
+    assert writes[-1]["status"] == "completed"
+    assert [w for w in writes if "status" not in w] == [{"progress": 60}]
+    assert flask_app.progress_buffer.pending() == {}
+
+
+def test_write_progress_rechecks_rails_first(monkeypatch):
+    # Another worker completed the enrollment, or saved a later position, after this value was buffered
+    rails = {"id": 10, "status": "in_progress", "progress": 50}
+    patches = []
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+
+    def fake_api_get(path, employee_id=None, fresh=False):
+        assert path == "enrollments/10" and fresh
+        return rails
+
+    def fake_api_patch(path, data, employee_id=None):
+        patches.append(data["enrollment"]["progress"])
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "api_get", fake_api_get)
+    monkeypatch.setattr(flask_app, "api_patch", fake_api_patch)
+
+    assert flask_app.write_progress(10, 40, 1) is True # never lowers progress
+    rails["status"] = "completed"
+    assert flask_app.write_progress(10, 60, 1) is True
+    assert patches == []
+
+    rails["status"] = "in_progress"
+    assert flask_app.write_progress(10, 60, 1) is True
+    assert patches == [60]
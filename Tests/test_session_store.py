@@ -0,0 +1,113 @@
+from unittest.mock import MagicMock
+import pytest
+import app as flask_app
+import session_store
+
+
+@pytest.fixture(autouse=True)
+def server_sessions(monkeypatch):
+    # A fresh in-memory store per test instead of the shared sqlite file the app starts with
+    monkeypatch.setattr(flask_app.app, "session_interface", session_store.ServerSessionInterface(session_store.MemoryStore()))
+
+
+def login(client, monkeypatch, http, record):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = record
+    monkeypatch.setattr(http, "post", lambda url, json=None, **kwargs: mock_resp)
+    return client.post("/login", data={"email": record["email"], "hire_date": "2024-01-01"})
+
+
+def test_cookie_carries_only_session_id(client, monkeypatch, http, employee_user):
+    resp = login(client, monkeypatch, http, employee_user)
+
+    cookie = resp.headers["Set-Cookie"]
+    assert employee_user["email"] not in cookie
+    sid = client.get_cookie("session").value
+    assert flask_app.app.session_interface.store.get(sid) is not None
+
+    with client.session_transaction() as sess:
+        assert sess["employee"]["id"] == employee_user["id"]
+
+
+def test_session_keeps_compact_employee(client, monkeypatch, http, employee_user):
+    login(client, monkeypatch, http, {**employee_user, "created_at": "2024-01-01", "enrollments": [{"id": 9}] * 50})
+
+    with client.session_transaction() as sess:
+        assert "enrollments" not in sess["employee"]
+        assert "created_at" not in sess["employee"]
+        assert sess["employee"]["email"] == employee_user["email"]
+
+
+def test_logout_drops_server_copy(client, monkeypatch, http, employee_user):
+    login(client, monkeypatch, http, employee_user)
+    sid = client.get_cookie("session").value
+
+    client.get("/logout")
+    assert flask_app.app.session_interface.store.get(sid) is None
+
+
+def test_login_issues_new_session_id(client, monkeypatch, http, employee_user):
+    failed = MagicMock()
+    failed.status_code = 401
+    monkeypatch.setattr(http, "post", lambda url, json=None, **kwargs: failed)
+    client.post("/login", data={"email": "nobody@example.com", "hire_date": "2024-01-01"}) # Flash saves an anonymous session
+    anonymous = client.get_cookie("session").value
+    store = flask_app.app.session_interface.store
+    assert store.get(anonymous) is not None
+
+    login(client, monkeypatch, http, employee_user)
+    sid = client.get_cookie("session").value
+    assert sid != anonymous
+    assert store.get(anonymous) is None # A planted id is worthless after login
+
+    client.get("/logout")
+    assert store.get(sid) is None
+
+
+def test_memory_backend_refused_with_several_workers(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    with pytest.raises(ValueError):
+        session_store.build_interface("memory")
+    assert session_store.build_interface("cookie") is None
+    assert isinstance(session_store.build_interface().store, session_store.SqliteStore) # Server-side unless opted out
+
+
+def test_profile_update_refreshes_session(client, monkeypatch, http, employee_user):
+    login(client, monkeypatch, http, employee_user)
+    updated = MagicMock()
+    updated.status_code = 200
+    updated.json.return_value = {**employee_user, "first_name": "Renamed"}
+    monkeypatch.setattr(http, "patch", lambda url, **kwargs: updated)
+
+    client.post("/employee/profile", data={
+        "first_name": "Renamed", "last_name": "User", "email": employee_user["email"],
+        "position": "Dev", "department": "IT", "phone": "1", "gender": "Other",
+    })
+
+    with client.session_transaction() as sess:
+        assert sess["employee"]["first_name"] == "Renamed"
+
+
+def test_memory_store_evicts_oldest_and_expires():
+    now = [0]
+    store = session_store.MemoryStore(max_entries=2, clock=lambda: now[0])
+    store.set("a", "1", ttl=10)
+    store.set("b", "2", ttl=10)
+    store.get("a")
+    store.set("c", "3", ttl=10)
+    assert store.get("b") is None
+    assert store.get("a") == "1"
+
+    now[0] = 11
+    assert store.get("a") is None
+
+
+def test_sqlite_store_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    first, second = session_store.SqliteStore(path), session_store.SqliteStore(path)
+
+    first.set("sid", '{"employee": 1}', ttl=60)
+    assert second.get("sid") == '{"employee": 1}'
+    second.delete("sid")
+    assert first.get("sid") is None
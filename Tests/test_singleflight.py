@@ -0,0 +1,128 @@
+import threading
+import time
+from unittest.mock import MagicMock
+import requests
+from flask import g
+import app as flask_app
+from singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return ["shared"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(group.do("courses", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    while group.stats()["collapsed"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == [["shared"]] * 5
+    assert all(r is results[0] for r in results)
+    assert group.stats() == {"leaders": 1, "collapsed": 4, "timeouts": 0, "in_flight": 0}
+
+
+def test_errors_propagate_and_next_call_retries():
+    group = SingleFlight()
+
+    def boom():
+        raise RuntimeError("down")
+
+    try:
+        group.do("courses", boom)
+    except RuntimeError:
+        time.sleep(0.001)
+    assert group.do("courses", lambda: "ok") == "ok"
+
+
+def test_waiter_gives_up_after_max_wait():
+    group = SingleFlight(max_wait=0.01)
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: group.do("courses", lambda: release.wait(2)))
+    leader.start()
+    while group.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+
+    assert group.do("courses", lambda: "own fetch") == "own fetch"
+    assert group.stats()["timeouts"] == 1
+    release.set()
+    leader.join()
+
+
+def test_api_get_collapses_identical_requests(monkeypatch, http):
+    release = threading.Event()
+    calls = []
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = [{"id": 1}]
+
+    def slow_get(url, params=None, **kwargs):
+        calls.append(url)
+        release.wait(2)
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", slow_get)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flask_app.api_get("courses"))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while flask_app.flights.stats()["collapsed"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [[{"id": 1}]] * 3
+
+
+def test_follower_fetches_itself_when_leader_runs_out_of_budget(app, monkeypatch, http):
+    release = threading.Event()
+    calls = []
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = [{"id": 1}]
+
+    def get(url, params=None, **kwargs):
+        calls.append(url)
+        if len(calls) == 1: # the leader, its page's budget runs out mid-call
+            release.wait(2)
+            raise requests.exceptions.ReadTimeout("budget spent")
+        return mock_resp
+
+    monkeypatch.setattr(flask_app, "get_current_employee", lambda: {"id": 1})
+    monkeypatch.setattr(http, "get", get)
+
+    def leader():
+        with app.test_request_context("/"):
+            g.deadline = time.monotonic() + 1
+            flask_app.api_get("courses")
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    while flask_app.flights.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+    results = []
+    follower = threading.Thread(target=lambda: results.append(flask_app.api_get("courses")))
+    follower.start()
+    while flask_app.flights.stats()["collapsed"] < 1:
+        time.sleep(0.001)
+    release.set()
+    thread.join()
+    follower.join()
+
+    assert results == [[{"id": 1}]]
+    assert len(calls) == 2
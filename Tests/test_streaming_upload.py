@@ -0,0 +1,128 @@
+import io
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from tempfile import TemporaryFile
+from unittest.mock import MagicMock
+
+import pytest
+from werkzeug.formparser import parse_form_data
+from werkzeug.test import EnvironBuilder
+
+import api_client
+import app as flask_app
+from streaming_upload import MultipartUpload
+
+
+def parse(body, content_type):
+    environ = EnvironBuilder(method="POST", input_stream=io.BytesIO(body), content_type=content_type, content_length=len(body)).get_environ()
+    _, form, files = parse_form_data(environ)
+    return form, files
+
+
+class Unseekable(io.RawIOBase): # Like a socket or a pipe
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._data.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def test_body_parses_as_multipart_and_length_matches():
+    upload = MultipartUpload(
+        {"certificate[name]": "Fire \"Safety\"", "certificate[employee_id]": 7, "skipped": None},
+        {
+            "certificate[document]": ("cert.pdf", io.BytesIO(b"%PDF" * 1000), "application/pdf"),
+            "raw": ("raw.bin", Unseekable(b"x" * 5000)),
+            "inline": ("inline.txt", b"hello", "text/plain"),
+        },
+        chunk_size=512,
+    )
+    body = b"".join(upload)
+    assert len(body) == len(upload)
+    assert b"".join(upload) == body # Every iteration starts over, so the upload can be retried
+
+    form, files = parse(body, upload.content_type)
+    assert form.to_dict() == {"certificate[name]": "Fire \"Safety\"", "certificate[employee_id]": "7"}
+    assert files["certificate[document]"].read() == b"%PDF" * 1000
+    assert files["certificate[document]"].mimetype == "application/pdf"
+    assert files["raw"].read() == b"x" * 5000
+    assert (files["inline"].filename, files["inline"].read()) == ("inline.txt", b"hello")
+
+
+def test_large_file_is_sent_with_bounded_memory():
+    size = 20 * 1024 * 1024
+    with TemporaryFile() as f:
+        f.truncate(size)
+        upload = MultipartUpload({}, {"file": ("big.bin", f)}, chunk_size=64 * 1024)
+        tracemalloc.start()
+        try:
+            sent = sum(len(chunk) for chunk in upload)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    assert sent == len(upload) > size
+    assert peak < 1024 * 1024
+
+
+@pytest.fixture
+def rails_server():
+    received = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received["headers"] = dict(self.headers)
+            received["body"] = self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", received
+    server.shutdown()
+    server.server_close()
+
+
+def test_api_post_streams_certificate_upload(monkeypatch, rails_server):
+    url, received = rails_server
+    monkeypatch.setattr(flask_app, "RAILS_API_URL", url)
+    api_client.set_session(api_client.build_session(pool_size=1))
+    try:
+        ok, errors = flask_app.upload_certificate({
+            "name": "Fire Safety", "description": "Done", "issued_on": "2024-01-01", "expiry_date": "2025-01-01",
+            "employee_id": 3, "course_id": 7, "requested_by": 2,
+        }, io.BytesIO(b"%PDF-1.4 test"))
+    finally:
+        api_client.set_session(None)
+
+    assert (ok, errors) == (True, [])
+    headers = received["headers"]
+    assert "Transfer-Encoding" not in headers
+    assert int(headers["Content-Length"]) == len(received["body"])
+    form, files = parse(received["body"], headers["Content-Type"])
+    assert form["certificate[employee_id]"] == "3"
+    assert files["certificate[document]"].read() == b"%PDF-1.4 test"
+
+
+def test_api_patch_sends_files_as_multipart(monkeypatch):
+    calls = []
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    monkeypatch.setattr(flask_app, "upstream", lambda method, path, **kwargs: calls.append((method, kwargs)) or mock_resp)
+
+    flask_app.api_patch("certificates/1", {"certificate[name]": "New"}, files={"certificate[document]": ("a.png", b"png")}, employee_id=2)
+
+    method, kwargs = calls[0]
+    assert method == "patch" and kwargs["params"] == {"employee_id": 2}
+    assert isinstance(kwargs["data"], MultipartUpload)
+    assert kwargs["headers"]["Content-Type"] == kwargs["data"].content_type
@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+
+# Seconds the admin dashboard aggregate is served before a background refresh is started
+ADMIN_SUMMARY_TTL = float(os.environ.get("ADMIN_SUMMARY_TTL", "120"))
+
+
+class SummaryCache:
+    """
+    Stale-while-revalidate holder for the admin dashboard aggregate, one per admin.
+    Rails authorises every GET by the employee_id it is given, so a summary computed with one admin's
+    id is never shown to another. get() never calls Rails itself: it returns that admin's last summary
+    (or None before the first one) and starts compute(employee_id) on a background thread when it is missing or stale.
+    """
+
+    def __init__(self, compute, ttl=ADMIN_SUMMARY_TTL, clock=time.monotonic):
+        self.compute = compute
+        self.ttl = ttl
+        self.clock = clock
+        self._summaries = {}   # employee_id -> summary
+        self._computed_at = {} # employee_id -> when it was computed
+        self._threads = {}     # employee_id -> refresh thread
+        self._lock = threading.Lock()
+
+    def get(self, employee_id):
+        with self._lock:
+            computed_at = self._computed_at.get(employee_id)
+            fresh = computed_at is not None and self.clock() - computed_at < self.ttl
+            thread = self._threads.get(employee_id)
+            if not fresh and (thread is None or not thread.is_alive()):
+                thread = threading.Thread(target=self.refresh, args=(employee_id,), name="admin-summary", daemon=True)
+                self._threads[employee_id] = thread
+                thread.start()
+            return self._summaries.get(employee_id)
+
+    def refresh(self, employee_id):
+        try:
+            summary = self.compute(employee_id)
+        except Exception as e:
+            print("Summary error:", e)
+            return
+        if summary is not None: # A failed fetch keeps serving the previous summary
+            with self._lock:
+                self._summaries[employee_id] = summary
+                self._computed_at[employee_id] = self.clock()
+
+    def expire(self):
+        # A write changed the counts, every admin's summary is refreshed on their next view
+        with self._lock:
+            self._computed_at.clear()
+
+    def wait(self, timeout=None):
+        for thread in list(self._threads.values()):
+            thread.join(timeout)
+
+    def clear(self):
+        self.wait()
+        with self._lock:
+            self._summaries.clear()
+            self._computed_at.clear()
+            self._threads.clear()
+
+
+def summarize(employees, courses, enrollments, certificates):
+    completed = sum(1 for e in enrollments if e.get("status") == "completed")
+    return {
+        "employees": len(employees),
+        "admins": sum(1 for e in employees if e.get("admin")),
+        "courses": len(courses),
+        "enrollments": len(enrollments),
+        "active_enrollments": sum(1 for e in enrollments if e.get("status") == "active"),
+        "completed_enrollments": completed,
+        "completion_rate": round(100 * completed / len(enrollments)) if enrollments else 0,
+        "certificates": len(certificates),
+    }
@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def _parse_ttls(raw): # "courses=60,enrollments=10" -> {"courses": 60.0, "enrollments": 10.0}
+    ttls = {}
+    for item in (raw or "").split(","):
+        if "=" in item:
+            name, seconds = item.split("=", 1)
+            ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+# Seconds a cached GET stays fresh, keyed by top-level resource
+DEFAULT_TTLS = {"courses": 60, "employees": 30, "certificates": 60, "enrollments": 10}
+API_CACHE_TTLS = {**DEFAULT_TTLS, **_parse_ttls(os.environ.get("API_CACHE_TTLS"))}
+API_CACHE_DEFAULT_TTL = float(os.environ.get("API_CACHE_DEFAULT_TTL", "30")) # Any resource not listed above
+API_CACHE_SIZE = int(os.environ.get("API_CACHE_SIZE", "256")) # Max cached responses per worker
+
+# Writes to a resource also evict the resources whose payloads embed it
+DEPENDENTS = {
+    "courses": ("enrollments", "certificates"),
+    "employees": ("enrollments", "certificates"),
+}
+
+MISS = object() # Returned by get() so a cached empty list is still a hit
+
+
+def _base(path): # courses?page=2 -> courses, every page of a listing is invalidated with it
+    return path.strip("/").split("?", 1)[0]
+
+
+def _root(path):
+    return _base(path).split("/", 1)[0]
+
+
+class ApiCache:
+    """
+    In-process LRU of parsed GET responses keyed by (path, employee scope).
+    Entries expire after a per-resource TTL and are evicted when a write touches the same resource.
+    """
+
+    def __init__(self, max_entries=API_CACHE_SIZE, ttls=None, default_ttl=API_CACHE_DEFAULT_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttls = API_CACHE_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._entries = OrderedDict() # (path, scope) -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_hits = 0
+
+    def ttl_for(self, path):
+        return self.ttls.get(_root(path), self.default_ttl)
+
+    def get(self, path, scope):
+        key = (path.strip("/"), scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                self.misses += 1 # Expired entries stay until LRU eviction, as a fallback for get_stale()
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_stale(self, path, scope):
+        # Last good response regardless of TTL, served while Rails is failing
+        with self._lock:
+            entry = self._entries.get((path.strip("/"), scope))
+            if entry is None:
+                return MISS
+            self.stale_hits += 1
+            return entry[1]
+
+    def set(self, path, scope, value):
+        ttl = self.ttl_for(path)
+        if ttl <= 0:
+            return
+        key = (path.strip("/"), scope)
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, path):
+        # courses/12 evicts courses, courses/12 and anything below it, for every scope
+        path = _base(path)
+        dependents = DEPENDENTS.get(_root(path), ())
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if _base(key[0]) == path
+                or path.startswith(_base(key[0]) + "/")
+                or _base(key[0]).startswith(path + "/")
+                or _root(key[0]) in dependents
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = self.stale_hits = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_hits": self.stale_hits,
+                "size": len(self._entries),
+            }
+
+
+cache = ApiCache() # Process-wide cache used by api_get
@@ -0,0 +1,59 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of keep-alive connections each worker process holds open to the Rails API
+API_POOL_SIZE = int(os.environ.get("API_POOL_SIZE", "10"))
+
+# Seconds to wait for a connection to the Rails API and then for its response
+API_CONNECT_TIMEOUT = float(os.environ.get("API_CONNECT_TIMEOUT", "3.05"))
+API_READ_TIMEOUT = float(os.environ.get("API_READ_TIMEOUT", "20"))
+DEFAULT_TIMEOUT = (API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
+
+
+class UpstreamError(Exception):
+    """
+    Rails answered with a 5xx, treated like a timeout or connection error.
+    """
+
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+def build_session(pool_size=API_POOL_SIZE):
+    """
+    Build a requests.Session backed by a bounded keep-alive connection pool.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide pooled session, creating it on first use.
+    A new pool is built after a fork so workers never share sockets.
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _lock:
+            if _session is None or _session_pid != os.getpid():
+                _session = build_session()
+                _session_pid = os.getpid()
+    return _session
+
+
+def set_session(session):
+    """
+    Install the session used for every upstream call (tests and benchmarks inject fakes here).
+    Passing None drops the current pool so the next call builds a fresh one.
+    """
+    global _session, _session_pid
+    with _lock:
+        _session = session
+        _session_pid = os.getpid() if session is not None else None
@@ -0,0 +1,175 @@
+"""
+Static asset pipeline: fingerprints everything under Static/ into Static/dist/,
+precompresses text assets to .gz/.br and writes resized JPEG/WebP variants of images.
+
+    python -m assets          # build Static/dist/ and its manifest.json
+
+Templates call asset_url("css/base.css") which returns the fingerprinted /assets/ URL,
+served with an immutable Cache-Control. Without a build it falls back to plain /static/ URLs.
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+
+from flask import url_for
+from PIL import Image
+
+try: # Brotli is optional, only .gz files are written when it is not installed
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, "Static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST = "manifest.json"
+
+ASSETS_AUTO_BUILD = os.environ.get("ASSETS_AUTO_BUILD", "true").lower() in ("1", "true", "yes") # Build on first use when missing or stale
+ASSETS_MAX_AGE = int(os.environ.get("ASSETS_MAX_AGE", "31536000")) # Fingerprinted files never change, cache for a year
+IMAGE_WIDTHS = tuple(int(w) for w in os.environ.get("ASSETS_IMAGE_WIDTHS", "400,800").split(",") if w)
+
+PRECOMPRESS = (".css", ".js", ".svg", ".json", ".txt")
+RESIZABLE = (".jpg", ".jpeg", ".png")
+
+
+def _fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _hashed_name(logical, data, suffix=None, ext=None):
+    # css/base.css -> css/base.3f2a9c1b0d4e.css
+    stem, original_ext = os.path.splitext(logical)
+    return f"{stem}{suffix or ''}.{_fingerprint(data)}{ext or original_ext}"
+
+
+def _write(out_dir, name, data):
+    # Written to a temp file first so a worker never serves a half written asset
+    path = os.path.join(out_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _sources(static_dir, out_dir):
+    for folder, dirs, files in os.walk(static_dir):
+        if os.path.abspath(folder).startswith(os.path.abspath(out_dir)):
+            continue
+        for filename in sorted(files):
+            path = os.path.join(folder, filename)
+            yield os.path.relpath(path, static_dir).replace(os.sep, "/"), path
+
+
+def _image_variants(logical, data, widths):
+    # (suffix, extension, mimetype, width, bytes) for each resized JPEG / WebP copy
+    with Image.open(io.BytesIO(data)) as original:
+        image = original.convert("RGB")
+    variants = []
+    for width in sorted({min(w, image.width) for w in widths}):
+        resized = image if width == image.width else image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        for fmt, ext, mimetype, options in (
+            ("JPEG", os.path.splitext(logical)[1], "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+            ("WEBP", ".webp", "image/webp", {"quality": 80, "method": 6}),
+        ):
+            if fmt == "JPEG" and width == image.width and mimetype == Image.MIME.get(original.format):
+                encoded = data # Re-encoding the full size original only makes it bigger
+            else:
+                buffer = io.BytesIO()
+                resized.save(buffer, fmt, **options)
+                encoded = buffer.getvalue()
+            variants.append((f"-{width}", ext, mimetype, width, encoded))
+    return variants
+
+
+def build(static_dir=STATIC_DIR, out_dir=DIST_DIR, widths=IMAGE_WIDTHS):
+    """
+    Fingerprint every source asset into out_dir and return the manifest:
+    {"files": {logical: hashed}, "variants": {logical: [{"path", "type", "width"}, ...]}}
+    """
+    manifest = {"files": {}, "variants": {}}
+    for logical, path in _sources(static_dir, out_dir):
+        with open(path, "rb") as f:
+            data = f.read()
+        hashed = _hashed_name(logical, data)
+        _write(out_dir, hashed, data)
+        manifest["files"][logical] = hashed
+
+        if logical.endswith(PRECOMPRESS):
+            _write(out_dir, hashed + ".gz", gzip.compress(data, 9, mtime=0))
+            if brotli is not None:
+                _write(out_dir, hashed + ".br", brotli.compress(data, quality=11))
+
+        if logical.lower().endswith(RESIZABLE):
+            variants = []
+            for suffix, ext, mimetype, width, variant in _image_variants(logical, data, widths):
+                name = _hashed_name(logical, variant, suffix, ext)
+                _write(out_dir, name, variant)
+                variants.append({"path": name, "type": mimetype, "width": width})
+            manifest["variants"][logical] = variants
+
+    _write(out_dir, MANIFEST, json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+class Assets:
+    """
+    Resolves logical asset names to fingerprinted URLs, building the dist folder on first use if needed.
+    """
+
+    def __init__(self, static_dir=STATIC_DIR, out_dir=DIST_DIR, auto_build=ASSETS_AUTO_BUILD):
+        self.static_dir = static_dir
+        self.out_dir = out_dir
+        self.auto_build = auto_build
+        self._manifest = None
+        self._lock = threading.Lock()
+
+    def _stale(self):
+        manifest_path = os.path.join(self.out_dir, MANIFEST)
+        if not os.path.exists(manifest_path):
+            return True
+        built_at = os.path.getmtime(manifest_path)
+        return any(os.path.getmtime(path) > built_at for _, path in _sources(self.static_dir, self.out_dir))
+
+    def manifest(self):
+        if self._manifest is None:
+            with self._lock:
+                if self._manifest is None:
+                    self._manifest = self._load()
+        return self._manifest
+
+    def _load(self):
+        try:
+            if self.auto_build and self._stale():
+                return build(self.static_dir, self.out_dir)
+            with open(os.path.join(self.out_dir, MANIFEST)) as f:
+                return json.load(f)
+        except Exception as e: # Read-only disk or a broken build, plain /static/ URLs still work
+            print("Assets error:", e)
+            return {"files": {}, "variants": {}}
+
+    def url(self, filename):
+        hashed = self.manifest()["files"].get(filename)
+        if hashed is None:
+            return url_for("static", filename=filename)
+        return url_for("serve_asset", filename=hashed)
+
+    def srcset(self, filename, mimetype):
+        # "…-400.webp 400w, …-800.webp 800w", empty when there are no variants of that type
+        variants = self.manifest()["variants"].get(filename, [])
+        return ", ".join(f"{url_for('serve_asset', filename=v['path'])} {v['width']}w" for v in variants if v["type"] == mimetype)
+
+    def reset(self):
+        with self._lock:
+            self._manifest = None
+
+
+assets = Assets() # Process-wide resolver used by the templates
+
+
+if __name__ == "__main__":
+    result = build()
+    print(f"Built {len(result['files'])} assets and {sum(len(v) for v in result['variants'].values())} image variants into {DIST_DIR}")
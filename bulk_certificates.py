@@ -0,0 +1,173 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# Processes rendering bulk certificate PDFs (ReportLab holds the GIL), 0 renders on threads instead
+CERTIFICATE_RENDER_PROCESSES = int(os.environ.get("CERTIFICATE_RENDER_PROCESSES", str(min(4, os.cpu_count() or 1))))
+# Certificate uploads to Rails in flight at once for one batch
+CERTIFICATE_UPLOAD_CONCURRENCY = int(os.environ.get("CERTIFICATE_UPLOAD_CONCURRENCY", "4"))
+# Attempts per certificate before it is reported as failed
+CERTIFICATE_UPLOAD_ATTEMPTS = int(os.environ.get("CERTIFICATE_UPLOAD_ATTEMPTS", "3"))
+
+RUNNING, DONE, FAILED = "running", "done", "failed"
+
+
+class BulkIssuance:
+    """
+    Issues one certificate per recipient in the background: PDFs are rendered on a process pool,
+    uploaded with bounded concurrency and retried individually. render(params) returns PDF bytes and
+    must be picklable, upload(params, pdf) returns (ok, errors). Optionally every PDF is kept in a ZIP.
+    """
+
+    def __init__(self, render, upload, processes=CERTIFICATE_RENDER_PROCESSES, upload_concurrency=CERTIFICATE_UPLOAD_CONCURRENCY,
+                 attempts=CERTIFICATE_UPLOAD_ATTEMPTS, retry_delay=0.5, retention=3600):
+        self.render = render
+        self.upload = upload
+        self.processes = processes
+        self.upload_concurrency = upload_concurrency
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+        self.retention = retention
+        self._batches = {} # batch_id -> status dict
+        self._zips = {}    # batch_id -> BytesIO holding the ZIP
+        self._threads = {}
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def submit(self, base_params, recipients, keep_zip=False):
+        """
+        recipients: [{"employee_id": ..., "recipient": "First Last"}], merged over base_params per certificate.
+        """
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune()
+            self._batches[batch_id] = {
+                "id": batch_id, "status": RUNNING, "total": len(recipients), "rendered": 0, "uploaded": 0,
+                "failed": 0, "retries": 0, "errors": [], "zip": keep_zip, "created_at": time.time(), "finished_at": None,
+            }
+            if keep_zip:
+                self._zips[batch_id] = io.BytesIO()
+        thread = threading.Thread(target=self._run, args=(batch_id, base_params, recipients), name="certificate-bulk", daemon=True)
+        self._threads[batch_id] = thread
+        thread.start()
+        return batch_id
+
+    def status(self, batch_id):
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            return dict(batch, errors=list(batch["errors"])) if batch else None
+
+    def zip_file(self, batch_id):
+        # Finished ZIP as a fresh file object, None while running or when it was not requested
+        with self._lock:
+            batch, archive = self._batches.get(batch_id), self._zips.get(batch_id)
+            if not batch or archive is None or batch["status"] == RUNNING:
+                return None
+            return io.BytesIO(archive.getvalue())
+
+    def join(self):
+        for thread in list(self._threads.values()):
+            thread.join()
+
+    def clear(self):
+        self.join()
+        with self._lock:
+            self._batches.clear()
+            self._zips.clear()
+            self._threads.clear()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # Internals
+
+    def _renderer(self):
+        # Spawned (not forked) so the workers never inherit the web process's threads and sockets
+        if self.processes <= 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _update(self, batch_id, **changes):
+        with self._lock:
+            batch = self._batches[batch_id]
+            for key, amount in changes.items():
+                batch[key] += amount
+
+    def _fail(self, batch_id, params, error):
+        with self._lock:
+            batch = self._batches[batch_id]
+            batch["failed"] += 1
+            batch["errors"].append({"employee_id": params.get("employee_id"), "recipient": params.get("recipient"), "error": error})
+
+    def _add_to_zip(self, batch_id, params, pdf):
+        with self._lock:
+            archive = self._zips.get(batch_id)
+            if archive is None:
+                return
+            name = f"certificate-{params.get('employee_id')}-{(params.get('recipient') or '').replace(' ', '_')}.pdf"
+            with zipfile.ZipFile(archive, "a", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr(name, pdf)
+
+    def _upload_with_retries(self, batch_id, params, pdf):
+        errors = []
+        for attempt in range(self.attempts):
+            if attempt:
+                self._update(batch_id, retries=1)
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            try:
+                ok, errors = self.upload(params, io.BytesIO(pdf)) # A fresh stream per attempt
+            except Exception as e:
+                ok, errors = False, [str(e)]
+            if ok:
+                self._update(batch_id, uploaded=1)
+                return
+        self._fail(batch_id, params, "; ".join(errors) or "Upload failed.")
+
+    def _run(self, batch_id, base_params, recipients):
+        jobs = [{**base_params, **recipient} for recipient in recipients]
+        pool = self._renderer()
+        try:
+            with ThreadPoolExecutor(max_workers=self.upload_concurrency, thread_name_prefix="certificate-upload") as uploads:
+                if pool is not None:
+                    renders = {pool.submit(self.render, params): params for params in jobs}
+                else:
+                    renders = {uploads.submit(self.render, params): params for params in jobs}
+                pending_uploads = []
+                for future in as_completed(renders):
+                    params = renders[future]
+                    try:
+                        pdf = future.result()
+                    except Exception as e:
+                        print("Certificate render error:", e)
+                        self._fail(batch_id, params, f"Render failed: {e}")
+                        continue
+                    self._update(batch_id, rendered=1)
+                    self._add_to_zip(batch_id, params, pdf)
+                    pending_uploads.append(uploads.submit(self._upload_with_retries, batch_id, params, pdf))
+                for future in pending_uploads:
+                    future.result()
+        except Exception as e:
+            print("Certificate bulk error:", e)
+            with self._lock:
+                self._batches[batch_id]["errors"].append({"error": str(e)})
+        with self._lock:
+            batch = self._batches[batch_id]
+            batch["status"] = DONE if batch["uploaded"] == batch["total"] else FAILED
+            batch["finished_at"] = time.time()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for batch_id in [b for b, batch in self._batches.items() if batch["finished_at"] and batch["finished_at"] < cutoff]:
+            del self._batches[batch_id]
+            self._zips.pop(batch_id, None)
+            self._threads.pop(batch_id, None)
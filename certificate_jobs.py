@@ -0,0 +1,106 @@
+import os
+import queue
+import threading
+import time
+import uuid
+
+# Worker threads that render and upload certificate PDFs
+CERTIFICATE_WORKERS = int(os.environ.get("CERTIFICATE_WORKERS", "2"))
+# Seconds a finished job's status stays available for polling
+CERTIFICATE_JOB_RETENTION = float(os.environ.get("CERTIFICATE_JOB_RETENTION", "3600"))
+# Seconds shutdown waits for queued and running jobs before the process exits without them
+CERTIFICATE_DRAIN_TIMEOUT = float(os.environ.get("CERTIFICATE_DRAIN_TIMEOUT", "30"))
+
+QUEUED, RENDERING, UPLOADING, DONE, FAILED = "queued", "rendering", "uploading", "done", "failed"
+
+
+class CertificateJobs:
+    """
+    In-process job queue for certificate PDFs.
+    render(params) returns the PDF file object, upload(params, pdf) returns (ok, errors).
+    Each job moves queued -> rendering -> uploading -> done/failed and can be polled by id.
+    Jobs only live in this process: close() drains the queue on shutdown, whatever is left when it
+    gives up (or on a hard kill) is lost and has to be submitted again.
+    """
+
+    def __init__(self, render, upload, workers=CERTIFICATE_WORKERS, retention=CERTIFICATE_JOB_RETENTION):
+        self.render = render
+        self.upload = upload
+        self.workers = workers
+        self.retention = retention
+        self._queue = queue.Queue()
+        self._jobs = {} # job_id -> status dict
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, params):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = {"id": job_id, "status": QUEUED, "errors": [], "created_at": time.time(), "finished_at": None}
+            self._start()
+        self._queue.put((job_id, params))
+        return job_id
+
+    def status(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job, errors=list(job["errors"])) if job else None
+
+    def join(self):
+        # Block until every submitted job has finished
+        self._queue.join()
+
+    def close(self, timeout=CERTIFICATE_DRAIN_TIMEOUT):
+        # Let the workers finish what was submitted (registered with atexit), True when nothing was left behind
+        until = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < until:
+            time.sleep(0.05)
+        left = self._queue.unfinished_tasks
+        if left:
+            print(f"Certificate jobs: {left} unfinished at shutdown")
+        return not left
+
+    def clear(self):
+        self.join()
+        with self._lock:
+            self._jobs.clear()
+
+    def _set(self, job_id, status, errors=None):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["status"] = status
+            if errors:
+                job["errors"] = list(errors)
+            if status in (DONE, FAILED):
+                job["finished_at"] = time.time()
+
+    def _run(self):
+        while True:
+            job_id, params = self._queue.get()
+            try:
+                self._set(job_id, RENDERING)
+                pdf = self.render(params)
+                self._set(job_id, UPLOADING)
+                ok, errors = self.upload(params, pdf)
+                self._set(job_id, DONE if ok else FAILED, errors)
+            except Exception as e:
+                print("Certificate job error:", e)
+                self._set(job_id, FAILED, [str(e)])
+            finally:
+                self._queue.task_done()
+
+    def _start(self):
+        # Worker threads are started on first use so forked web workers each get their own
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._run, name="certificate-worker", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [j for j, job in self._jobs.items() if job["finished_at"] and job["finished_at"] < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,96 @@
+import io
+
+from reportlab.lib.pagesizes import A4 # Set the page size to A4
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.pdfbase.pdfmetrics import getFont
+from reportlab.pdfgen import canvas
+
+from logo_cache import logos
+
+
+class TextStyle:
+    def __init__(self, font, size, leading, space_after=0):
+        self.font = font
+        self.size = size
+        self.leading = leading
+        self.space_after = space_after
+        getFont(font) # Fail at startup, not on the first certificate, if the font is missing
+
+
+class CertificateRenderer:
+    """
+    Draws certificate PDFs straight onto a canvas.
+    Fonts, styles and the page layout are worked out once; each certificate only
+    wraps and draws its own text (name, description, issuer, dates) and logo.
+    Same page as the old flowable layout: A4, 40pt side margins, 60pt top margin,
+    120x120 logo, centred 28pt title, 14pt description and a 12pt footer.
+    Text that reaches the 40pt bottom margin continues on a new page, as the flowables did.
+    """
+
+    LOGO_SIZE = 120
+    LOGO_GAP = 20
+
+    def __init__(self, pagesize=A4, margin_x=40, margin_top=60, margin_bottom=40):
+        self.width, self.height = pagesize
+        self.pagesize = pagesize
+        self.center = self.width / 2
+        self.text_width = self.width - 2 * margin_x - 12 # Frame padding of the old SimpleDocTemplate
+        self.top = self.height - margin_top - 6
+        self.bottom = margin_bottom + 6
+
+        self.title = TextStyle("Helvetica-Bold", 28, 34, space_after=20)
+        self.recipient = TextStyle("Helvetica-Oblique", 18, 24, space_after=20)
+        self.description = TextStyle("Helvetica", 14, 18, space_after=30)
+        self.footer = TextStyle("Helvetica", 12, 16)
+        self.footer_labels = ("Issued by: ", "Issued On: ", "Expiry Date: ")
+
+    def _lines(self, text, style):
+        return simpleSplit(str(text or ""), style.font, style.size, self.text_width)
+
+    def _draw(self, pdf, lines, style, y):
+        pdf.setFont(style.font, style.size)
+        for line in lines:
+            if y - style.leading < self.bottom: # Out of room, carry on at the top of a new page
+                pdf.showPage()
+                pdf.setFont(style.font, style.size) # showPage resets the graphics state
+                y = self.top
+            y -= style.leading
+            pdf.drawCentredString(self.center, y, line)
+        return max(y - style.space_after, self.bottom) # Spacing never pushes the next line off the page
+
+    def render(self, params):
+        pdf_buffer = io.BytesIO()
+        pdf = canvas.Canvas(pdf_buffer, pagesize=self.pagesize)
+        y = self.top
+
+        if params.get("logo"):
+            try:
+                logo = ImageReader(io.BytesIO(logos.get(params["logo"]).data)) # Downscaled once per distinct logo
+                y -= self.LOGO_SIZE
+                pdf.drawImage(logo, self.center - self.LOGO_SIZE / 2, y, self.LOGO_SIZE, self.LOGO_SIZE, mask="auto")
+                y -= self.LOGO_GAP
+            except Exception:
+                y = self.top # Unreadable logo, the certificate is still issued without it
+
+        y = self._draw(pdf, self._lines(params["name"], self.title), self.title, y)
+        if params.get("recipient"): # Bulk issued certificates name the employee they were awarded to
+            y = self._draw(pdf, self._lines(f"Awarded to {params['recipient']}", self.recipient), self.recipient, y)
+        y = self._draw(pdf, self._lines(params["description"], self.description), self.description, y)
+        footer = [
+            label + str(value)
+            for label, value in zip(self.footer_labels, (params["issuer"], params["issued_on"], params["expiry_date"]))
+        ]
+        self._draw(pdf, footer, self.footer, y)
+
+        pdf.showPage()
+        pdf.save()
+        pdf_buffer.seek(0)
+        return pdf_buffer
+
+
+renderer = CertificateRenderer() # Built once at import, shared by the certificate workers
+
+
+def render_certificate(params):
+    # PDF bytes, module level so a process pool can pickle it
+    return renderer.render(params).getvalue()
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+# Consecutive failures (timeouts, connection errors, 5xx) that open a resource's circuit
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+# Seconds an open circuit rejects calls before letting one trial call through
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get("CIRCUIT_RESET_TIMEOUT", "30"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class _Circuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+
+class CircuitBreaker:
+    """
+    One closed/open/half-open circuit per Rails resource (courses, enrollments, ...).
+    Open circuits fail fast with CircuitOpenError instead of tying up a worker on a dead API;
+    after reset_timeout a single trial call decides whether to close again.
+    """
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def before_call(self, resource):
+        # Raises CircuitOpenError when the call must not go out
+        with self._lock:
+            circuit = self._circuits.setdefault(resource, _Circuit())
+            if circuit.state == CLOSED:
+                return
+            if circuit.state == OPEN and self.clock() - circuit.opened_at >= self.reset_timeout:
+                circuit.state = HALF_OPEN
+                circuit.trial_in_flight = False
+            if circuit.state == HALF_OPEN and not circuit.trial_in_flight:
+                circuit.trial_in_flight = True
+                return
+            raise CircuitOpenError(f"circuit open for {resource}")
+
+    def record_success(self, resource):
+        with self._lock:
+            circuit = self._circuits.setdefault(resource, _Circuit())
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.trial_in_flight = False
+
+    def record_failure(self, resource):
+        with self._lock:
+            circuit = self._circuits.setdefault(resource, _Circuit())
+            circuit.failures += 1
+            circuit.trial_in_flight = False
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.opened_at = self.clock()
+
+    def release(self, resource):
+        # The call ended without telling us anything about Rails (the page ran out of time), a trial may go out again
+        with self._lock:
+            circuit = self._circuits.get(resource)
+            if circuit:
+                circuit.trial_in_flight = False
+
+    def state(self, resource):
+        with self._lock:
+            circuit = self._circuits.get(resource)
+            return circuit.state if circuit else CLOSED
+
+    def states(self):
+        with self._lock:
+            return {resource: circuit.state for resource, circuit in self._circuits.items()}
+
+    def reset(self):
+        with self._lock:
+            self._circuits.clear()
+
+
+breaker = CircuitBreaker() # Process-wide breaker used by app.upstream
@@ -0,0 +1,87 @@
+import os
+import zlib
+
+try: # Brotli is optional, gzip is used when it is not installed
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "500")) # Bytes, smaller bodies are sent as is
+COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", "6")) # gzip level 1-9
+COMPRESS_BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", "5")) # brotli quality 0-11
+# Rendered bytes of a streamed page between sync flushes, so the browser gets the table as it renders
+COMPRESS_STREAM_FLUSH = int(os.environ.get("COMPRESS_STREAM_FLUSH", "16384"))
+COMPRESS_MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/javascript",
+    "application/javascript", "application/json", "image/svg+xml",
+}
+
+
+def choose_encoding(accept_encodings):
+    # Best encoding the client accepts (werkzeug Accept object), None for identity
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return accept_encodings.best_match(offered) if accept_encodings else None
+
+
+class _Compressor:
+    def __init__(self, encoding, level=COMPRESS_LEVEL, quality=COMPRESS_BROTLI_QUALITY):
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=quality)
+            self.compress, self.finish, self.sync = self._obj.process, self._obj.finish, self._obj.flush
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31) # wbits 31 writes a gzip header
+            self.compress, self.finish = self._obj.compress, self._obj.flush
+            self.sync = lambda: self._obj.flush(zlib.Z_SYNC_FLUSH) # Emits everything so far, the stream stays open
+
+
+def compress(data, encoding, level=COMPRESS_LEVEL, quality=COMPRESS_BROTLI_QUALITY):
+    compressor = _Compressor(encoding, level, quality)
+    return compressor.compress(data) + compressor.finish()
+
+
+def _compress_stream(chunks, encoding, flush_every=COMPRESS_STREAM_FLUSH):
+    # Without sync flushes the compressor would sit on hundreds of KB of HTML before emitting anything
+    compressor = _Compressor(encoding)
+    unflushed = 0
+    for chunk in chunks:
+        chunk = chunk.encode() if isinstance(chunk, str) else chunk
+        out = compressor.compress(chunk)
+        unflushed += len(chunk)
+        if unflushed >= flush_every:
+            out += compressor.sync()
+            unflushed = 0
+        if out:
+            yield out
+    yield compressor.finish()
+
+
+def compress_response(response, accept_encodings, min_size=COMPRESS_MIN_SIZE):
+    """
+    Compress a Flask response in place when the client accepts gzip/br and it is worth it.
+    Streamed responses are compressed chunk by chunk so they stay streamed.
+    """
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough # send_file, leave files and Range handling alone
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESS_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(compress(body, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,100 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Max URLs whose ETag/Last-Modified and parsed body are kept for revalidation
+API_VALIDATOR_SIZE = int(os.environ.get("API_VALIDATOR_SIZE", "128"))
+
+MISS = object()
+
+
+class ValidatorStore:
+    """
+    Remembers ETag / Last-Modified and the parsed body per (path, employee scope)
+    so api_get can revalidate with If-None-Match / If-Modified-Since and reuse the body on a 304.
+    Also tracks, per route, what was downloaded and decoded versus what a 304 saved.
+    """
+
+    def __init__(self, max_entries=API_VALIDATOR_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # key -> {"etag", "last_modified", "data", "bytes", "decode_ms"}
+        self._routes = {}             # route -> counters
+        self._lock = threading.Lock()
+
+    def headers_for(self, path, scope):
+        with self._lock:
+            entry = self._entries.get((path, scope))
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def remember(self, path, scope, response_headers, data, nbytes, decode_ms, route):
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        etag = etag if isinstance(etag, str) else None
+        last_modified = last_modified if isinstance(last_modified, str) else None
+
+        with self._lock:
+            counters = self._counters(route)
+            counters["full"] += 1
+            counters["bytes_downloaded"] += nbytes
+            counters["decode_ms"] += decode_ms
+            if etag or last_modified:
+                key = (path, scope)
+                self._entries[key] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "data": data,
+                    "bytes": nbytes,
+                    "decode_ms": decode_ms,
+                }
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def reuse(self, path, scope, route):
+        # Body for a 304, or MISS if it was evicted since the validators were sent
+        with self._lock:
+            entry = self._entries.get((path, scope))
+            if entry is None:
+                return MISS
+            self._entries.move_to_end((path, scope))
+            counters = self._counters(route)
+            counters["not_modified"] += 1
+            counters["bytes_saved"] += entry["bytes"]
+            counters["decode_ms_saved"] += entry["decode_ms"]
+            return entry["data"]
+
+    def forget(self, path, scope):
+        with self._lock:
+            self._entries.pop((path, scope), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._routes.clear()
+
+    def stats(self):
+        with self._lock:
+            return {route: dict(counters) for route, counters in self._routes.items()}
+
+    def _counters(self, route):
+        counters = self._routes.get(route)
+        if counters is None:
+            counters = self._routes[route] = {
+                "full": 0,
+                "not_modified": 0,
+                "bytes_downloaded": 0,
+                "bytes_saved": 0,
+                "decode_ms": 0.0,
+                "decode_ms_saved": 0.0,
+            }
+        return counters
+
+
+validators = ValidatorStore() # Process-wide store used by api_get
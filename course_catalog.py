@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+# Seconds the indexed catalog is trusted before courses are fetched again
+COURSE_CATALOG_TTL = float(os.environ.get("COURSE_CATALOG_TTL", "60"))
+# Set when the Rails courses index accepts ?department=, otherwise the full list is fetched and split here
+RAILS_DEPARTMENT_FILTER = os.environ.get("RAILS_DEPARTMENT_FILTER", "false").lower() in ("1", "true", "yes")
+
+ALL = object() # _loaded_at key for a fetch of every department at once
+
+
+def _sort_key(course): # Soonest start first, undated courses last, then by title
+    return (not course.get("start_date"), str(course.get("start_date") or ""), str(course.get("title") or "").lower(), course.get("id") or 0)
+
+
+class CourseCatalog:
+    """
+    Courses indexed by department, each department kept as a pre-sorted tuple.
+    Filled from the full courses list (or one department's slice when Rails filters by
+    department) and patched in place after our own course writes.
+    """
+
+    def __init__(self, ttl=COURSE_CATALOG_TTL, upstream_filter=RAILS_DEPARTMENT_FILTER, clock=time.monotonic):
+        self.ttl = ttl
+        self.upstream_filter = upstream_filter
+        self.clock = clock
+        self._by_id = {}          # course_id -> course
+        self._by_department = {}  # department -> tuple of courses, sorted
+        self._loaded_at = {}      # department (or ALL) -> when it was last fetched
+        self._lock = threading.RLock()
+
+    def for_department(self, department, loader):
+        """
+        Sorted courses of one department. loader(department) returns that department's courses
+        when upstream_filter is set, loader(None) returns every course otherwise; None on failure.
+        """
+        if not department:
+            return ()
+        key = department if self.upstream_filter else ALL
+        with self._lock:
+            loaded_at = self._loaded_at.get(key)
+            fresh = loaded_at is not None and self.clock() - loaded_at < self.ttl
+        if not fresh:
+            courses = loader(department if self.upstream_filter else None)
+            if courses is not None:
+                self.load(courses, department if self.upstream_filter else None)
+        with self._lock:
+            return self._by_department.get(department, ())
+
+    def load(self, courses, department=None):
+        # department=None replaces the whole catalog, otherwise only that department's slice
+        now = self.clock()
+        if department is not None:
+            courses = [c for c in courses if c.get("department") == department] # In case Rails ignored the filter
+        with self._lock:
+            if department is None:
+                self._by_id.clear()
+                self._by_department.clear()
+                self._loaded_at.clear()
+            else:
+                for course in self._by_department.get(department, ()):
+                    self._by_id.pop(course.get("id"), None)
+            grouped = {}
+            for course in courses:
+                self._by_id[course.get("id")] = course
+                grouped.setdefault(course.get("department"), []).append(course)
+            if department is not None:
+                grouped.setdefault(department, [])
+            for dept, rows in grouped.items():
+                self._by_department[dept] = tuple(sorted(rows, key=_sort_key))
+            self._loaded_at[ALL if department is None else department] = now
+
+    def upsert(self, course):
+        # A course Rails just returned from a create or update
+        with self._lock:
+            old = self._by_id.get(course.get("id"))
+            if old is not None:
+                self._discard(old)
+            if self._loaded(course.get("department")):
+                self._by_id[course.get("id")] = course
+                self._resort(course.get("department"), self._by_department.get(course.get("department"), ()) + (course,))
+
+    def update(self, course_id, changes):
+        # Apply the fields we just PATCHed; the cached record is copied, never mutated
+        with self._lock:
+            old = self._by_id.get(course_id)
+            if old is not None:
+                self.upsert({**old, **changes, "id": course_id})
+
+    def remove(self, course_id):
+        with self._lock:
+            old = self._by_id.get(course_id)
+            if old is not None:
+                self._discard(old)
+
+    def expire(self):
+        # Next lookup for any department goes back to Rails
+        with self._lock:
+            self._loaded_at.clear()
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._by_department.clear()
+            self._loaded_at.clear()
+
+    def _loaded(self, department):
+        # Only departments we hold a list for are patched, others are fetched whole when first asked for
+        return ALL in self._loaded_at or department in self._loaded_at
+
+    def _discard(self, course):
+        self._by_id.pop(course.get("id"), None)
+        dept = course.get("department")
+        if dept in self._by_department:
+            self._by_department[dept] = tuple(c for c in self._by_department[dept] if c.get("id") != course.get("id"))
+
+    def _resort(self, department, courses):
+        self._by_department[department] = tuple(sorted(courses, key=_sort_key))
+
+
+catalog = CourseCatalog() # Process-wide catalog shared by the course routes
@@ -0,0 +1,55 @@
+import os
+import time
+
+
+def _parse_budgets(raw): # "admin_enrollments=8,take_course=5" -> {"admin_enrollments": 8.0, "take_course": 5.0}
+    budgets = {}
+    for item in (raw or "").split(","):
+        if "=" in item:
+            endpoint, seconds = item.split("=", 1)
+            budgets[endpoint.strip()] = float(seconds)
+    return budgets
+
+
+# Seconds a page may spend waiting on Rails in total, across all of its upstream calls (0 disables)
+REQUEST_DEADLINE = float(os.environ.get("REQUEST_DEADLINE", "10"))
+# Per-route overrides keyed by Flask endpoint name
+REQUEST_DEADLINES = _parse_budgets(os.environ.get("REQUEST_DEADLINES"))
+
+
+class DeadlineExceeded(Exception):
+    """
+    The request's time budget is spent, no further upstream calls are made for it.
+    """
+
+
+def budget_for(endpoint, budgets=None, default=REQUEST_DEADLINE):
+    budgets = REQUEST_DEADLINES if budgets is None else budgets
+    return budgets.get(endpoint, default)
+
+
+def start(endpoint, clock=time.monotonic):
+    # Absolute deadline for a request to this endpoint, None when the route has no budget
+    budget = budget_for(endpoint)
+    return clock() + budget if budget > 0 else None
+
+
+def remaining(deadline, clock=time.monotonic):
+    if deadline is None:
+        return None
+    return max(0.0, deadline - clock())
+
+
+def clamp_timeout(timeout, deadline, clock=time.monotonic):
+    """
+    Shrink a requests (connect, read) timeout so the call cannot outlive the deadline.
+    Raises DeadlineExceeded when nothing is left.
+    """
+    left = remaining(deadline, clock)
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("request deadline exceeded")
+    if isinstance(timeout, tuple):
+        return tuple(min(part, left) for part in timeout)
+    return min(timeout, left) if timeout is not None else left
@@ -0,0 +1,151 @@
+"""
+On-disk cache of certificate PDFs, stored under the SHA-256 of their content.
+
+The document URL Rails returns changes whenever a certificate's document is replaced, so it is
+used as the lookup key: url -> digest -> <dir>/<digest[:2]>/<digest>.pdf. The same PDF reached
+through different URLs is stored once. Files are evicted least recently used first once the
+directory grows past CERTIFICATE_CACHE_SIZE, worker processes share the files on disk.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from singleflight import flights
+
+CERTIFICATE_CACHE_DIR = os.environ.get("CERTIFICATE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "skillzone-certificates"))
+CERTIFICATE_CACHE_SIZE = int(os.environ.get("CERTIFICATE_CACHE_SIZE", str(256 * 1024 * 1024))) # Bytes on disk before LRU eviction
+CERTIFICATE_CACHE_URLS = int(os.environ.get("CERTIFICATE_CACHE_URLS", "10000")) # Document URLs remembered per worker
+
+SUFFIX = ".pdf"
+
+
+class _HashingWriter:
+    # Hashes and counts everything written through it, so the download is read once
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk):
+        self.digest.update(chunk)
+        self.size += len(chunk)
+        return self.f.write(chunk)
+
+
+class DocumentCache:
+    """
+    get(url, download) returns (path, digest) for the cached copy of url, calling
+    download(url, writer) to stream it into the cache on a miss. download raises on failure.
+    """
+
+    def __init__(self, directory=CERTIFICATE_CACHE_DIR, max_bytes=CERTIFICATE_CACHE_SIZE, max_urls=CERTIFICATE_CACHE_URLS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_urls = max_urls
+        self._urls = OrderedDict()  # url -> digest
+        self._files = None          # digest -> size, least recently used first, loaded from disk on first use
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path_for(self, digest):
+        return os.path.join(self.directory, digest[:2], digest + SUFFIX)
+
+    def get(self, url, download):
+        with self._lock:
+            digest = self._urls.get(url)
+            if digest is not None and self._touch(digest):
+                self._urls.move_to_end(url)
+                self.hits += 1
+                return self.path_for(digest), digest
+            self.misses += 1
+        # Concurrent first clicks on the same certificate share one download
+        return flights.do(("document", url), lambda: self._fill(url, download))
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(self._load().values())
+
+    def clear(self):
+        with self._lock:
+            for digest in list(self._load()):
+                self._remove(digest)
+            self._urls.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    # Internals, called with the lock held unless noted
+
+    def _load(self):
+        # Files other workers (or a previous run) left behind, oldest access first
+        if self._files is None:
+            found = []
+            if os.path.isdir(self.directory):
+                for folder, _, names in os.walk(self.directory):
+                    for name in names:
+                        if name.endswith(SUFFIX):
+                            stat = os.stat(os.path.join(folder, name))
+                            found.append((stat.st_mtime, name[:-len(SUFFIX)], stat.st_size))
+            self._files = OrderedDict((digest, size) for _, digest, size in sorted(found))
+        return self._files
+
+    def _touch(self, digest):
+        # Marks the file recently used, False when another worker evicted it
+        try:
+            os.utime(self.path_for(digest)) # mtime is the recency other workers see on startup
+        except FileNotFoundError:
+            self._load().pop(digest, None)
+            return False
+        files = self._load()
+        if digest in files:
+            files.move_to_end(digest)
+        return True
+
+    def _remove(self, digest):
+        self._files.pop(digest, None)
+        try:
+            os.remove(self.path_for(digest))
+        except FileNotFoundError:
+            pass
+
+    def _fill(self, url, download):
+        # Runs without the lock, the download goes to a temp file in the cache directory and is renamed into place
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer = _HashingWriter(f)
+                download(url, writer)
+            digest = writer.digest.hexdigest()
+            path = self.path_for(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp, path) # Atomic, a reader never sees a partial PDF
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._lock:
+            files = self._load()
+            files[digest] = writer.size
+            files.move_to_end(digest)
+            self._urls[url] = digest
+            self._urls.move_to_end(url)
+            while len(self._urls) > self.max_urls:
+                self._urls.popitem(last=False)
+            total = sum(files.values())
+            while total > self.max_bytes and len(files) > 1:
+                oldest, size = next(iter(files.items()))
+                if oldest == digest:
+                    break
+                self._remove(oldest)
+                self.evictions += 1
+                total -= size
+        return path, digest
+
+
+documents = DocumentCache() # Process-wide, shares its directory with the other workers
@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+
+# Seconds an employee's indexed enrollments are trusted before they are fetched again
+ENROLLMENT_INDEX_TTL = float(os.environ.get("ENROLLMENT_INDEX_TTL", "30"))
+
+
+def _ids(enrollment): # Rails nests employee/course objects, flat *_id fields are accepted too
+    employee = enrollment.get("employee") or {}
+    course = enrollment.get("course") or {}
+    return employee.get("id", enrollment.get("employee_id")), course.get("id", enrollment.get("course_id"))
+
+
+def group_by_employee(enrollments): # employee_id -> [enrollment, ...] in one pass, for pages listing every employee
+    grouped = {}
+    for e in enrollments:
+        grouped.setdefault(_ids(e)[0], []).append(e)
+    return grouped
+
+
+class EnrollmentIndex:
+    """
+    Enrollments indexed by (employee_id, course_id) and by employee_id.
+    Built from the fetched enrollments list and patched in place after our own writes,
+    so routes look up one enrollment without rescanning the whole collection.
+    """
+
+    def __init__(self, ttl=ENROLLMENT_INDEX_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._by_id = {}        # enrollment_id -> enrollment
+        self._by_pair = {}      # (employee_id, course_id) -> enrollment
+        self._by_employee = {}  # employee_id -> {enrollment_id: enrollment}
+        self._loaded_at = {}    # employee_id -> when their enrollments were last fetched
+        self._lock = threading.RLock()
+
+    def load(self, enrollments, employee_id=None):
+        # The listing may be the whole company or only this employee's slice, so only
+        # employees that appear in it (plus the one we asked for) are replaced
+        now = self.clock()
+        grouped = group_by_employee(enrollments)
+        if employee_id is not None:
+            grouped.setdefault(employee_id, [])
+
+        with self._lock:
+            for emp_id, rows in grouped.items():
+                for old in list(self._by_employee.get(emp_id, {}).values()):
+                    self._discard(old)
+                for e in rows:
+                    self._add(e)
+                self._by_employee.setdefault(emp_id, {})
+                self._loaded_at[emp_id] = now
+
+    def ensure(self, employee_id, loader, force=False):
+        # Fetch through loader() only when this employee has never been indexed or has gone stale, True if it fetched
+        with self._lock:
+            loaded_at = self._loaded_at.get(employee_id)
+            if not force and loaded_at is not None and self.clock() - loaded_at < self.ttl:
+                return False
+        enrollments = loader()
+        if enrollments is not None:
+            self.load(enrollments, employee_id)
+        return True
+
+    def find(self, employee_id, course_id, loader, reload=None):
+        # reload() makes the one retry after a miss and must get past any cache in front of Rails, loader by default
+        fetched = self.ensure(employee_id, loader)
+        with self._lock:
+            enrollment = self._by_pair.get((employee_id, course_id))
+        if enrollment is not None or fetched:
+            return enrollment
+        # Only found entries are trusted for the TTL: another worker may have just created this enrollment
+        self.ensure(employee_id, reload or loader, force=True)
+        with self._lock:
+            return self._by_pair.get((employee_id, course_id))
+
+    def for_employee(self, employee_id, loader):
+        self.ensure(employee_id, loader)
+        with self._lock:
+            return list(self._by_employee.get(employee_id, {}).values())
+
+    def upsert(self, enrollment):
+        with self._lock:
+            old = self._by_id.get(enrollment.get("id"))
+            if old is not None:
+                self._discard(old)
+            self._add(enrollment)
+
+    def update(self, enrollment_id, changes):
+        # Apply the fields we just PATCHed; the cached record is copied, never mutated
+        with self._lock:
+            old = self._by_id.get(enrollment_id)
+            if old is not None:
+                self.upsert({**old, **changes})
+
+    def remove(self, enrollment_id):
+        with self._lock:
+            old = self._by_id.get(enrollment_id)
+            if old is not None:
+                self._discard(old)
+
+    def remove_course(self, course_id):
+        with self._lock:
+            for e in [e for e in self._by_id.values() if _ids(e)[1] == course_id]:
+                self._discard(e)
+
+    def expire(self, employee_id):
+        # Next lookup for this employee goes back to Rails
+        with self._lock:
+            self._loaded_at.pop(employee_id, None)
+
+    def expire_enrollment(self, enrollment_id):
+        with self._lock:
+            old = self._by_id.get(enrollment_id)
+            if old is not None:
+                self._discard(old)
+                self.expire(_ids(old)[0])
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._by_pair.clear()
+            self._by_employee.clear()
+            self._loaded_at.clear()
+
+    def _add(self, enrollment):
+        employee_id, course_id = _ids(enrollment)
+        self._by_id[enrollment.get("id")] = enrollment
+        self._by_pair[(employee_id, course_id)] = enrollment
+        self._by_employee.setdefault(employee_id, {})[enrollment.get("id")] = enrollment
+
+    def _discard(self, enrollment):
+        employee_id, course_id = _ids(enrollment)
+        self._by_id.pop(enrollment.get("id"), None)
+        if self._by_pair.get((employee_id, course_id)) is enrollment:
+            del self._by_pair[(employee_id, course_id)]
+        self._by_employee.get(employee_id, {}).pop(enrollment.get("id"), None)
+
+
+index = EnrollmentIndex() # Process-wide index shared by the enrollment routes
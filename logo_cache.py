@@ -0,0 +1,112 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from PIL import Image, ImageOps
+
+# Longest side of a normalized logo in pixels: the 120pt certificate logo at 2x for print
+LOGO_PIXELS = int(os.environ.get("LOGO_PIXELS", "240"))
+LOGO_JPEG_QUALITY = int(os.environ.get("LOGO_JPEG_QUALITY", "85"))
+LOGO_CACHE_SIZE = int(os.environ.get("LOGO_CACHE_SIZE", "64")) # Normalized logos kept per process
+
+# data: bytes to embed or upload, mimetype/extension are None when the input was passed through untouched
+Logo = namedtuple("Logo", "data mimetype extension")
+
+
+def _digest(data, chunk_size=65536):
+    # bytes, or a seekable binary file hashed in chunks and rewound to where it was
+    if isinstance(data, (bytes, bytearray)):
+        return hashlib.sha256(data).hexdigest()
+    start, digest = data.tell(), hashlib.sha256()
+    for chunk in iter(lambda: data.read(chunk_size), b""):
+        digest.update(chunk)
+    data.seek(start)
+    return digest.hexdigest()
+
+
+def _metadata(image):
+    return any(key in image.info for key in ("exif", "icc_profile", "xmp", "comment")) or bool(getattr(image, "text", None))
+
+
+def normalize(data, pixels=LOGO_PIXELS, quality=LOGO_JPEG_QUALITY):
+    """
+    Downscale an uploaded logo to at most pixels x pixels, drop EXIF/ICC/text metadata and re-encode it:
+    JPEG for opaque images (ReportLab embeds those without decoding), PNG when there is transparency.
+    data is bytes or a seekable binary file (e.g. an upload Werkzeug spooled to disk), only the
+    decoded image is held in memory. Raises whatever Pillow raises for unreadable data.
+    """
+    source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    start = source.tell()
+    with Image.open(source) as original:
+        size = original.size # Before draft() shrinks it
+        original.draft("RGB", (pixels, pixels)) # JPEGs decode straight at a fraction of their size
+        image = ImageOps.exif_transpose(original) # Keep phone photos upright once the EXIF tag is gone
+        image.thumbnail((pixels, pixels), Image.LANCZOS)
+
+        transparent = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+        target = "PNG" if transparent else "JPEG"
+        if original.format == target and max(size) <= pixels and not _metadata(original):
+            source.seek(start) # Already normalized, no second lossy pass
+            return Logo(source.read(), Image.MIME[target], ".png" if transparent else ".jpg")
+
+        buffer = io.BytesIO()
+        if transparent:
+            image.convert("RGBA").save(buffer, "PNG", optimize=True)
+            return Logo(buffer.getvalue(), "image/png", ".png")
+        image.convert("RGB").save(buffer, "JPEG", quality=quality, optimize=True)
+        return Logo(buffer.getvalue(), "image/jpeg", ".jpg")
+
+
+class LogoCache:
+    """
+    Normalized logos keyed by the SHA-256 of the uploaded bytes, so the same company logo is
+    decoded and resized once and then reused for every certificate that carries it.
+    """
+
+    def __init__(self, max_entries=LOGO_CACHE_SIZE, pixels=LOGO_PIXELS):
+        self.max_entries = max_entries
+        self.pixels = pixels
+        self._entries = OrderedDict() # sha256 -> Logo
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data):
+        """
+        Normalized Logo for the uploaded bytes or file. Data Pillow cannot read is passed through as is
+        (the file rewound), callers decide whether that is an error (the renderer leaves the logo out).
+        """
+        start = data.tell() if not isinstance(data, (bytes, bytearray)) else None
+        key = _digest(data)
+        with self._lock:
+            logo = self._entries.get(key)
+            if logo is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return logo
+            self.misses += 1
+
+        try:
+            logo = normalize(data, self.pixels)
+        except Exception as e:
+            print("Logo error:", e)
+            if start is not None:
+                data.seek(start)
+            return Logo(data, None, None)
+
+        with self._lock:
+            self._entries[key] = logo
+            self._entries[_digest(logo.data)] = logo # Already normalized bytes come back as a hit too
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return logo
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+logos = LogoCache() # Process-wide, each render process in the bulk pool keeps its own
@@ -0,0 +1,134 @@
+import re
+import threading
+
+# Histogram buckets in seconds, shared by request, upstream and decode timings
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def normalize_path(path): # courses/12/take -> courses/:id/take, keeps label cardinality bounded (query strings dropped)
+    return _ID_SEGMENT.sub("/:id", "/" + path.split("?", 1)[0].strip("/"))[1:]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Registry:
+    """
+    Minimal Prometheus registry: counters and histograms keyed by label tuples.
+    Recording is a dict update under a lock; text exposition is only built when /metrics is scraped.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._meta = {}       # name -> (type, help)
+        self._counters = {}   # name -> {labels: value}
+        self._histograms = {} # name -> {labels: [bucket counts..., sum, count]}
+        self._collectors = [] # callables returning extra (name, type, help, [(labels, value)])
+        self._lock = threading.Lock()
+
+    def counter(self, name, help):
+        self._meta[name] = ("counter", help)
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name, help):
+        self._meta[name] = ("histogram", help)
+        self._histograms.setdefault(name, {})
+
+    def register_collector(self, collector):
+        self._collectors.append(collector)
+
+    def inc(self, name, labels, amount=1):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def reset(self):
+        with self._lock:
+            for series in self._counters.values():
+                series.clear()
+            for series in self._histograms.values():
+                series.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, series in self._counters.items():
+                kind, help = self._meta[name]
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in series.items():
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+
+            for name, series in self._histograms.items():
+                kind, help = self._meta[name]
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, state in series.items():
+                    for bound, count in zip(self.buckets, state):
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {state[-2]}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {state[-1]}")
+
+        for collector in self._collectors:
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(tuple(sorted(labels.items())))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+registry.counter("skillzone_http_requests_total", "Requests handled by the frontend.")
+registry.histogram("skillzone_http_request_duration_seconds", "Time spent handling a frontend request.")
+registry.counter("skillzone_upstream_requests_total", "Calls made to the Rails API.")
+registry.histogram("skillzone_upstream_request_duration_seconds", "Latency of calls to the Rails API.")
+registry.counter("skillzone_upstream_response_bytes_total", "Response body bytes received from the Rails API.")
+registry.histogram("skillzone_upstream_decode_seconds", "Time spent decoding JSON from the Rails API.")
+registry.counter("skillzone_upstream_abandoned_total", "Fan-out calls given up on because the request deadline passed.")
+
+
+def observe_request(route, method, status, seconds):
+    registry.inc("skillzone_http_requests_total", {"route": route, "method": method, "status": status})
+    registry.observe("skillzone_http_request_duration_seconds", {"route": route}, seconds)
+
+
+def observe_upstream(route, method, path, status, seconds, nbytes):
+    path = normalize_path(path)
+    registry.inc("skillzone_upstream_requests_total", {"route": route, "method": method, "path": path, "status": status})
+    registry.observe("skillzone_upstream_request_duration_seconds", {"route": route, "method": method, "path": path}, seconds)
+    if nbytes:
+        registry.inc("skillzone_upstream_response_bytes_total", {"route": route, "path": path}, nbytes)
+
+
+def observe_decode(route, path, seconds):
+    registry.observe("skillzone_upstream_decode_seconds", {"route": route, "path": normalize_path(path)}, seconds)
+
+
+def observe_abandoned(route, count):
+    registry.inc("skillzone_upstream_abandoned_total", {"route": route}, count)
@@ -0,0 +1,84 @@
+import math
+import os
+from urllib.parse import urlencode
+
+# Rows per page on the admin list pages, overridable per request with ?per_page= up to the max
+ADMIN_PAGE_SIZE = int(os.environ.get("ADMIN_PAGE_SIZE", "50"))
+ADMIN_MAX_PAGE_SIZE = int(os.environ.get("ADMIN_MAX_PAGE_SIZE", "500"))
+# Set when the Rails index actions accept page/per_page, otherwise full lists are sliced here
+RAILS_PAGINATION = os.environ.get("RAILS_PAGINATION", "false").lower() in ("1", "true", "yes")
+
+
+def _positive_int(value, default):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+class Page:
+    """
+    One page of a collection. total is None when Rails paginated it and did not say how many there are,
+    then a full page is taken to mean there may be more.
+    """
+
+    def __init__(self, items, number, per_page, total=None, show_all=False):
+        self.items = items
+        self.number = number
+        self.per_page = per_page
+        self.total = total
+        self.show_all = show_all
+
+    @property
+    def pages(self):
+        if self.total is None:
+            return None
+        return max(1, math.ceil(self.total / self.per_page))
+
+    @property
+    def has_prev(self):
+        return not self.show_all and self.number > 1
+
+    @property
+    def has_next(self):
+        if self.show_all:
+            return False
+        if self.total is None:
+            return len(self.items) >= self.per_page
+        return self.number < self.pages
+
+
+class Pager:
+    """
+    Page request parsed from the query string: ?page=2&per_page=100, or ?all=1 for the whole list.
+    """
+
+    def __init__(self, page=1, per_page=ADMIN_PAGE_SIZE, show_all=False, rails_pagination=None):
+        self.page = page
+        self.per_page = min(per_page, ADMIN_MAX_PAGE_SIZE)
+        self.show_all = show_all
+        self.rails_pagination = RAILS_PAGINATION if rails_pagination is None else rails_pagination
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(
+            page=_positive_int(args.get("page"), 1),
+            per_page=_positive_int(args.get("per_page"), ADMIN_PAGE_SIZE),
+            show_all=args.get("all") in ("1", "true"),
+        )
+
+    def path(self, path):
+        # Upstream path to fetch: Rails does the paging when it can, otherwise the full list is fetched
+        if self.show_all or not self.rails_pagination:
+            return path
+        return f"{path}?{urlencode({'page': self.page, 'per_page': self.per_page})}"
+
+    def page_of(self, items):
+        items = items or []
+        if self.show_all:
+            return Page(items, 1, max(1, len(items)), total=len(items), show_all=True)
+        if self.rails_pagination:
+            return Page(items, self.page, self.per_page) # Already one page, the total is unknown
+        start = (self.page - 1) * self.per_page
+        return Page(items[start:start + self.per_page], self.page, self.per_page, total=len(items))
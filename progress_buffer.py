@@ -0,0 +1,102 @@
+import os
+import threading
+
+# Seconds between background flushes of buffered video progress
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get("PROGRESS_FLUSH_INTERVAL", "10"))
+# Failed writes are retried on later flushes this many times before being dropped
+PROGRESS_FLUSH_RETRIES = int(os.environ.get("PROGRESS_FLUSH_RETRIES", "3"))
+
+
+class ProgressBuffer:
+    """
+    Write-behind buffer for enrollment progress.
+    Keeps only the highest pending value per enrollment and hands them to writer(enrollment_id, progress, employee_id)
+    from a background thread. Only one flush runs at a time, so writes for an enrollment never overtake each other.
+    """
+
+    def __init__(self, writer, interval=PROGRESS_FLUSH_INTERVAL, retries=PROGRESS_FLUSH_RETRIES):
+        self.writer = writer
+        self.interval = interval
+        self.retries = retries
+        self._pending = {} # enrollment_id -> (progress, employee_id, attempts)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def add(self, enrollment_id, progress, employee_id):
+        with self._lock:
+            current = self._pending.get(enrollment_id)
+            if current is not None:
+                self.coalesced += 1
+                if current[0] >= progress:
+                    return
+            self._pending[enrollment_id] = (progress, employee_id, 0)
+        self._start()
+
+    def flush(self, enrollment_id=None):
+        # Write everything pending, or only one enrollment (used before marking it completed)
+        with self._flush_lock:
+            with self._lock:
+                if enrollment_id is None:
+                    batch, self._pending = self._pending, {}
+                elif enrollment_id in self._pending:
+                    batch = {enrollment_id: self._pending.pop(enrollment_id)}
+                else:
+                    batch = {}
+
+            for eid, (progress, employee_id, attempts) in batch.items():
+                try:
+                    ok = self.writer(eid, progress, employee_id)
+                except Exception as e:
+                    print("Progress flush error:", e)
+                    ok = False
+
+                if ok:
+                    self.written += 1
+                    continue
+                self.failed += 1
+                if attempts + 1 < self.retries:
+                    with self._lock: # Requeue unless a higher value arrived meanwhile
+                        current = self._pending.get(eid)
+                        if current is None or current[0] < progress:
+                            self._pending[eid] = (progress, employee_id, attempts + 1)
+
+    def discard(self, enrollment_id):
+        with self._lock:
+            self._pending.pop(enrollment_id, None)
+
+    def pending(self):
+        with self._lock:
+            return {eid: entry[0] for eid, entry in self._pending.items()}
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+    def close(self):
+        # Stop the flusher and write whatever is still buffered (registered with atexit)
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+        self.flush()
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="progress-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
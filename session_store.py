@@ -0,0 +1,199 @@
+import os
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from flask.json.tag import TaggedJSONSerializer # Same encoding Flask uses for cookie sessions (keeps flash tuples intact)
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+# sqlite (the default, several workers on one host), cookie (Flask's signed cookie, everything client side) or memory (one process only)
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "sqlite")
+SESSION_SQLITE_PATH = os.environ.get("SESSION_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "skillzone_sessions.sqlite3"))
+SESSION_LIFETIME = float(os.environ.get("SESSION_LIFETIME", "604800")) # Seconds a session survives after its last change
+SESSION_STORE_SIZE = int(os.environ.get("SESSION_STORE_SIZE", "10000")) # Max sessions kept by the memory backend
+
+serializer = TaggedJSONSerializer()
+
+
+class MemoryStore:
+    """
+    Per-process LRU of serialized sessions, oldest sessions are dropped first when full.
+    """
+
+    def __init__(self, max_entries=SESSION_STORE_SIZE, clock=time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict() # sid -> (expires_at, data)
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                del self._entries[sid]
+                return None
+            self._entries.move_to_end(sid)
+            return entry[1]
+
+    def set(self, sid, data, ttl):
+        with self._lock:
+            self._entries[sid] = (self.clock() + ttl, data)
+            self._entries.move_to_end(sid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._entries.pop(sid, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class SqliteStore:
+    """
+    Sessions in a SQLite file so every worker process on the host sees the same logins.
+    Each thread keeps its own connection; expired rows are purged now and then on write.
+    """
+
+    PURGE_EVERY = 100 # Writes between sweeps of expired rows
+
+    def __init__(self, path=SESSION_SQLITE_PATH, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _connect(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL") # Readers never block the writer
+            self._local.db = db
+        return db
+
+    def get(self, sid):
+        row = self._connect().execute(
+            "SELECT data FROM sessions WHERE sid = ? AND expires_at > ?", (sid, self.clock())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, sid, data, ttl):
+        now = self.clock()
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)", (sid, data, now + ttl))
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                db.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+
+    def delete(self, sid):
+        with self._connect() as db:
+            db.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def clear(self):
+        with self._connect() as db:
+            db.execute("DELETE FROM sessions")
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(session):
+            session.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.replaced_sid = None # Set by regenerate(), deleted from the store on save
+
+    def regenerate(self):
+        # New id for the same data, so an id handed out before login is worthless after it
+        if self.replaced_sid is None and not self.new:
+            self.replaced_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+def rotate(session):
+    # Called whenever the logged in identity changes; signed cookie sessions carry no id to fixate
+    if isinstance(session, ServerSession):
+        session.regenerate()
+
+
+class ServerSessionInterface(SessionInterface):
+    """
+    Keeps session data in a server-side store, the cookie only carries a random session id.
+    """
+
+    def __init__(self, store, lifetime=SESSION_LIFETIME):
+        self.store = store
+        self.lifetime = lifetime
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.get(sid)
+            if data is not None:
+                try:
+                    return ServerSession(serializer.loads(data), sid=sid)
+                except ValueError:
+                    pass # Unreadable entry, start over
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.replaced_sid is not None:
+            self.store.delete(session.replaced_sid)
+
+        if not session:
+            if session.modified: # Emptied (logout), drop the server copy too
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        response.vary.add("Cookie")
+        if not self.should_set_cookie(app, session):
+            return
+
+        self.store.set(session.sid, serializer.dumps(dict(session)), self.lifetime)
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def build_interface(backend=SESSION_BACKEND):
+    # None means keep Flask's default signed cookie session
+    if backend == "memory":
+        # Each worker would hold its own sessions and log users out at random, refuse instead
+        if int(os.environ.get("WEB_CONCURRENCY", "1")) > 1:
+            raise ValueError("SESSION_BACKEND=memory only works with a single worker, use sqlite or cookie")
+        return ServerSessionInterface(MemoryStore())
+    if backend == "sqlite":
+        return ServerSessionInterface(SqliteStore())
+    if backend == "cookie":
+        return None
+    raise ValueError(f"Unknown SESSION_BACKEND {backend!r}")
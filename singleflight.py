@@ -0,0 +1,73 @@
+import os
+import threading
+
+# Seconds a caller waits on someone else's identical in-flight GET before fetching itself
+API_SINGLEFLIGHT_MAX_WAIT = float(os.environ.get("API_SINGLEFLIGHT_MAX_WAIT", "10"))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller runs fn(),
+    everyone arriving while it is in flight waits (up to max_wait) and shares its result.
+    """
+
+    def __init__(self, max_wait=API_SINGLEFLIGHT_MAX_WAIT):
+        self.max_wait = max_wait
+        self._calls = {} # key -> _Call in flight
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.collapsed = 0
+        self.timeouts = 0
+
+    def do(self, key, fn, max_wait=None, private_errors=()):
+        # private_errors: exceptions that belong to the leader's own circumstances, waiters run fn() themselves instead
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            # Callers with less time left (a request deadline) give up sooner
+            wait = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+            if not call.done.wait(wait):
+                with self._lock:
+                    self.timeouts += 1
+                return fn() # The leader is stuck, fetch independently
+            if isinstance(call.error, private_errors):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"leaders": self.leaders, "collapsed": self.collapsed, "timeouts": self.timeouts, "in_flight": len(self._calls)}
+
+    def reset(self):
+        with self._lock:
+            self.leaders = self.collapsed = self.timeouts = 0
+
+
+flights = SingleFlight() # Process-wide group used by api_get
@@ -0,0 +1,102 @@
+import io
+import os
+import shutil
+import uuid
+from tempfile import SpooledTemporaryFile
+
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", "65536")) # Bytes read from a file per chunk sent to Rails
+UPLOAD_SPOOL_SIZE = int(os.environ.get("UPLOAD_SPOOL_SIZE", "1048576")) # Unseekable sources larger than this spool to disk
+
+CRLF = b"\r\n"
+
+
+def _quote(value):
+    return str(value).replace("\\", "\\\\").replace('"', "\\\"").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def spool(source, max_size=UPLOAD_SPOOL_SIZE, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Copy an unseekable stream into a SpooledTemporaryFile so its size is known and it can be re-sent.
+    Memory stays at max_size, anything beyond that goes to a temp file.
+    """
+    spooled = SpooledTemporaryFile(max_size=max_size)
+    shutil.copyfileobj(source, spooled, chunk_size)
+    spooled.seek(0)
+    return spooled
+
+
+def _seekable(source):
+    try:
+        return source.seekable()
+    except (AttributeError, ValueError):
+        return False
+
+
+class MultipartUpload:
+    """
+    multipart/form-data request body that is sent in chunks instead of being built in memory.
+    fields: {name: value}, files: {name: (filename, source[, content_type])} or {name: source} where source is bytes
+    or a binary file object, read UPLOAD_CHUNK_SIZE at a time from where it is positioned now.
+
+    Pass it as data= with headers={"Content-Type": upload.content_type}: requests takes the
+    Content-Length from len() and iterates the body, and every iteration starts from the beginning
+    so the same upload can be retried.
+    """
+
+    def __init__(self, fields=None, files=None, boundary=None, chunk_size=UPLOAD_CHUNK_SIZE):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self._parts = [] # (header bytes, body: bytes or (file, start, size))
+        for name, value in (fields or {}).items():
+            if value is None:
+                continue
+            header = f'Content-Disposition: form-data; name="{_quote(name)}"'
+            self._parts.append((self._header(header), str(value).encode() if not isinstance(value, bytes) else value))
+        for name, spec in (files or {}).items():
+            if not isinstance(spec, (tuple, list)): # Bare bytes or file, named after the field like requests does
+                spec = (getattr(spec, "name", None) or name, spec)
+            filename, source = os.path.basename(str(spec[0])), spec[1]
+            content_type = spec[2] if len(spec) > 2 and spec[2] else "application/octet-stream"
+            header = f'Content-Disposition: form-data; name="{_quote(name)}"; filename="{_quote(filename)}"\r\nContent-Type: {content_type}'
+            self._parts.append((self._header(header), self._body(source)))
+        self._closing = f"--{self.boundary}--\r\n".encode()
+
+    def _header(self, lines):
+        return f"--{self.boundary}\r\n{lines}\r\n\r\n".encode()
+
+    def _body(self, source):
+        if isinstance(source, (bytes, bytearray)):
+            return bytes(source)
+        if not _seekable(source):
+            source = spool(source, chunk_size=self.chunk_size)
+        start = source.tell()
+        size = source.seek(0, io.SEEK_END) - start
+        source.seek(start)
+        return source, start, size
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        total = len(self._closing)
+        for header, body in self._parts:
+            total += len(header) + (len(body) if isinstance(body, bytes) else body[2]) + len(CRLF)
+        return total
+
+    def __iter__(self):
+        for header, body in self._parts:
+            yield header
+            if isinstance(body, bytes):
+                yield body
+            else:
+                source, start, remaining = body
+                source.seek(start)
+                while remaining > 0:
+                    chunk = source.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        raise IOError("Upload source ended before its measured size")
+                    remaining -= len(chunk)
+                    yield chunk
+            yield CRLF
+        yield self._closing